@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ....posts import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of posts."
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("Rebuilding post search index...")
+
+        with transaction.atomic():
+            indexed_count = search.rebuild_index()
+
+        self.stdout.write(f"Indexed {indexed_count} post(s).")
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from ....core import caching
+from ....posts.models import Comment, Post, Reaction
+
+
+class Command(BaseCommand):
+    help = "Repair the stored like/dislike counts of posts and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts/comments recounted per transaction.",
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+
+        for model, target_field in ((Post, "post"), (Comment, "comment")):
+            self.stdout.write(f"Recounting {model._meta.verbose_name} reactions...")
+            repaired_count = self._recount(model, target_field, batch_size)
+            self.stdout.write(f"Repaired {repaired_count} row(s).")
+
+    # Walk the table in primary key order, one batch per transaction
+    def _recount(self, model, target_field, batch_size):
+        repaired_count = 0
+        last_pk = 0
+
+        while True:
+            with transaction.atomic():
+                targets = list(
+                    model.objects.select_for_update()
+                    .filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .only("pk", "like_count", "dislike_count")[:batch_size]
+                )
+
+                if not targets:
+                    return repaired_count
+
+                last_pk = targets[-1].pk
+                target_field_id = f"{target_field}_id"
+                counts = (
+                    Reaction.objects.filter(
+                        **{f"{target_field_id}__in": [target.pk for target in targets]}
+                    )
+                    .values(target_field_id, "type")
+                    .annotate(count=models.Count("pk"))
+                )
+                count_map = {
+                    (row[target_field_id], row["type"]): row["count"] for row in counts
+                }
+                drifted = []
+
+                for target in targets:
+                    like_count = count_map.get(
+                        (target.pk, Reaction.ReactionType.LIKE), 0
+                    )
+                    dislike_count = count_map.get(
+                        (target.pk, Reaction.ReactionType.DISLIKE), 0
+                    )
+
+                    if (target.like_count, target.dislike_count) != (
+                        like_count,
+                        dislike_count,
+                    ):
+                        target.like_count = like_count
+                        target.dislike_count = dislike_count
+                        target.version = models.F("version") + 1
+                        drifted.append(target)
+
+                if drifted:
+                    model.objects.bulk_update(
+                        drifted, ["like_count", "dislike_count", "version"]
+                    )
+                    caching.invalidate("posts", "comments")
+
+                repaired_count += len(drifted)
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ....core import images
+from ....posts.models import Post
+from ....profiles.models import Profile
+
+targets = [
+    images.ImageTarget(Post, "thumbnail", "thumbnail_status", ("posts",)),
+    images.ImageTarget(Profile, "pic", "pic_status"),
+]
+
+
+class Command(BaseCommand):
+    help = "Verify that pending post thumbnails and profile pics are images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of URLs of each model verified per pass.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.IMAGE_VERIFY_CONCURRENCY,
+            help="Number of URLs requested at once.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Seconds to wait for new URLs once all are verified. "
+            "By default, exit instead.",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Verify URLs that failed verification again.",
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        concurrency = kwargs["concurrency"]
+
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("Batch size and concurrency must be positive.")
+
+        if kwargs["retry_failed"]:
+            images.retry_failed(targets)
+
+        while True:
+            result = images.verify_images(
+                targets, batch_size=batch_size, max_workers=concurrency
+            )
+
+            if result.verified_count or result.failed_count:
+                self.stdout.write(
+                    f"Verified {result.verified_count} image(s), "
+                    f"{result.failed_count} failed."
+                )
+                continue
+
+            if not kwargs["interval"]:
+                self.stdout.write("No images pending verification.")
+                return
+
+            time.sleep(kwargs["interval"])
@@ -0,0 +1,46 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from ...core import model_factories as core_factories
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+from ...posts import search as posts_search
+
+
+class RebuildSearchIndexTest(TestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.post = posts_factories.PostFactory(
+            owner=core_factories.UserFactory(),
+            title="Rebuilding inverted indexes",
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        return super().setUp()
+
+    def search(self, query):
+        return list(posts_search.search_posts(posts_models.Post.objects.all(), query))
+
+    def test_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {posts_search.table_name}")
+
+        self.assertEqual(self.search("inverted"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        self.assertIn("Indexed 1 post(s).", out.getvalue())
+        self.assertEqual(self.search("inverted"), [self.post])
@@ -0,0 +1,66 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ...core import model_factories as core_factories
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+
+
+class RecountReactionsTest(TestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        posts_factories.ReactionFactory(
+            owner=self.user1,
+            post=self.post,
+            type=posts_models.Reaction.ReactionType.LIKE,
+        )
+        posts_factories.ReactionFactory(
+            owner=self.user1,
+            comment=self.comment,
+            type=posts_models.Reaction.ReactionType.DISLIKE,
+        )
+        return super().setUp()
+
+    def test_repairs_drift(self):
+        posts_models.Post.objects.update(like_count=7, dislike_count=3)
+        posts_models.Comment.objects.update(like_count=2, dislike_count=0)
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        post_version = self.post.version
+        comment_version = self.comment.version
+
+        with mock.patch("apps.core.caching.invalidate") as mock_invalidate:
+            call_command("recount_reactions", batch_size=1, stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (1, 0))
+        self.assertEqual((self.comment.like_count, self.comment.dislike_count), (0, 1))
+        # Clients revalidating with the previous version get the repaired counts
+        self.assertEqual(self.post.version, post_version + 1)
+        self.assertEqual(self.comment.version, comment_version + 1)
+        mock_invalidate.assert_called_with("posts", "comments")
+
+    def test_no_drift(self):
+        out = StringIO()
+        call_command("recount_reactions", stdout=out)
+        self.assertEqual(out.getvalue().count("Repaired 0 row(s)."), 2)
@@ -0,0 +1,111 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ...core import images
+from ...core import model_factories as core_factories
+from ...core.models import ImageStatus
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+from ..management.commands import verify_images
+
+
+class ImageHostStub(BaseHTTPRequestHandler):
+    # Paths under /images/ are images, others are pages
+    def do_HEAD(self):
+        self.send_response(200)
+
+        if self.path.startswith("/images/"):
+            self.send_header("Content-Type", "image/webp")
+        else:
+            self.send_header("Content-Type", "text/html")
+
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VerifyImagesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHostStub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        return super().tearDownClass()
+
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail=f"{self.base_url}/images/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.profile = self.user1.profile
+        self.profile.pic = f"{self.base_url}/pages/pic.webp"
+        self.profile.save()
+        return super().setUp()
+
+    def test_verify(self):
+        self.assertEqual(self.post.thumbnail_status, ImageStatus.PENDING)
+        self.assertEqual(self.profile.pic_status, ImageStatus.PENDING)
+        version = posts_models.Post.objects.get(pk=self.post.pk).version
+
+        out = StringIO()
+        call_command("verify_images", "--concurrency", "2", stdout=out)
+
+        self.assertIn("Verified 1 image(s), 1 failed.", out.getvalue())
+        self.post.refresh_from_db()
+        self.profile.refresh_from_db()
+        self.assertEqual(self.post.thumbnail_status, ImageStatus.VERIFIED)
+        self.assertEqual(self.post.version, version + 1)
+        self.assertEqual(self.profile.pic_status, ImageStatus.FAILED)
+
+        # Failed URLs are only requested again on retry
+        self.profile.pic = f"{self.base_url}/images/pic.webp"
+        self.profile.save(update_fields=["pic"])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.pic_status, ImageStatus.PENDING)
+        posts_models.Post.objects.filter(pk=self.post.pk).update(
+            thumbnail_status=ImageStatus.FAILED
+        )
+
+        out = StringIO()
+        call_command("verify_images", "--retry-failed", stdout=out)
+
+        self.assertIn("Verified 2 image(s), 0 failed.", out.getvalue())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.pic_status, ImageStatus.VERIFIED)
+
+    def test_retry_failed(self):
+        posts_models.Post.objects.filter(pk=self.post.pk).update(
+            thumbnail_status=ImageStatus.FAILED
+        )
+        version = posts_models.Post.objects.get(pk=self.post.pk).version
+
+        with mock.patch("apps.core.caching.invalidate") as mock_invalidate:
+            images.retry_failed(verify_images.targets)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.thumbnail_status, ImageStatus.PENDING)
+        self.assertEqual(self.post.version, version + 1)
+        mock_invalidate.assert_called_once_with("posts")
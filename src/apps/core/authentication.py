@@ -0,0 +1,73 @@
+"""
+Stateless authentication of access tokens.
+Tokens carry the username, roles and admin flags of their user along with the
+auth version of the user when they were issued, see
+core.serializers.auth.TokenObtainPairSerializer. While that version is current
+the user of a safe request is built from the claims without a query.
+Otherwise, e.g. after the groups or the password of the user changed, the user
+is loaded from the database. So is the user of an unsafe request, which may
+save the user, since that would write back claims that are stale within a
+version cache period. The current version is read from the shared cache at most every
+AUTH_VERSION_CACHE_SECONDS by each worker process, see core.roles.
+"""
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from . import roles
+
+auth_version_claim = "auth_version"
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    # Whether the user may be built from the claims
+    stateless = True
+
+    def authenticate(self, request):
+        self.stateless = request.method in permissions.SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        version = validated_token.get(auth_version_claim)
+
+        if (
+            not self.stateless
+            or version is None
+            or api_settings.USER_ID_CLAIM not in validated_token
+        ):
+            return super().get_user(validated_token)
+
+        user = self.get_token_user(validated_token)
+
+        if version != roles.format_version(roles.get_cached_version(user.pk)):
+            return super().get_user(validated_token)
+
+        return user
+
+    # A user with only the claimed fields loaded. Other fields are deferred,
+    # so they are loaded when accessed. Never saved, see authenticate.
+    def get_token_user(self, validated_token):
+        opts = self.user_model._meta
+        # The claim is a string
+        user_id = opts.get_field(api_settings.USER_ID_FIELD).to_python(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        loaded_values = {
+            api_settings.USER_ID_FIELD: user_id,
+            "username": validated_token["username"],
+            "is_staff": validated_token["is_staff"],
+            "is_superuser": validated_token["is_superuser"],
+            # Deactivating a user changes its auth version
+            "is_active": True,
+        }
+        field_names = [field.attname for field in opts.concrete_fields]
+        user = self.user_model.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [loaded_values.get(field_name, DEFERRED) for field_name in field_names],
+        )
+        user._roles = frozenset(validated_token["roles"])
+        return user
@@ -0,0 +1,85 @@
+"""
+Response caching for read endpoints.
+Cached responses are grouped in namespaces, each with a generation token that
+is part of every cache key. Invalidating a namespace replaces its token, which
+orphans all of its cached responses at once; orphans expire with their timeout.
+"""
+
+import hashlib
+import secrets
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Namespaces invalidated by the transaction of this thread
+_pending = threading.local()
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_generation(namespace):
+    cache = get_cache()
+    key = f"response-generation:{namespace}"
+    generation = cache.get(key)
+
+    if generation is None:
+        # Another process may have set the token in the meantime
+        cache.add(key, secrets.token_hex(8), None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def _replace_generations(namespaces):
+    get_cache().set_many(
+        {
+            f"response-generation:{namespace}": secrets.token_hex(8)
+            for namespace in namespaces
+        },
+        None,
+    )
+
+
+def _replace_pending_generations():
+    namespaces = _pending.__dict__.pop("namespaces", None)
+
+    if namespaces:
+        _replace_generations(namespaces)
+
+
+# Replace the tokens on commit, so a response cached by a concurrent reader
+# from data that was current before the commit is dropped. The namespaces of
+# a transaction are collected and replaced once, since a cascade invalidates
+# per row. The first callback replaces them, the others find none pending.
+def invalidate(*namespaces):
+    _pending.__dict__.setdefault("namespaces", set()).update(namespaces)
+    transaction.on_commit(_replace_pending_generations, robust=True)
+
+
+# Responses are sharded by user since visibility depends on who is asking.
+# The host is part of the key since hyperlinks in responses are absolute.
+def get_response_key(request, namespace):
+    if request.user.is_authenticated:
+        shard = f"user:{request.user.pk}"
+    else:
+        shard = "anon"
+
+    # Empty values are kept, since an empty cursor selects keyset pagination.
+    # Values stay in order, since e.g. the order of orderings matters.
+    params = sorted(request.query_params.lists())
+    representation = repr(
+        (
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.accepted_renderer.format,
+            params,
+        )
+    )
+    digest = hashlib.md5(representation.encode(), usedforsecurity=False)
+    generation = get_generation(namespace)
+    return f"response:{namespace}:{generation}:{shard}:{digest.hexdigest()}"
@@ -0,0 +1,63 @@
+"""
+Route the reads of list and retrieve requests to read only replicas.
+A view marks the reads it allows on a replica by setting replica_reads, see
+core.mixins.ReplicaReadsMixin. Writes and all other reads go to the primary.
+After a client writes, its reads are pinned to the primary for
+REPLICA_PIN_SECONDS by a signed cookie, so it reads its own writes while the
+replicas catch up, see core.middleware.ReplicaPinningMiddleware.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS
+
+pin_cookie_name = "primary_pin"
+pin_cookie_salt = "apps.core.db_routers.pin"
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+def is_pinned(request):
+    try:
+        request.get_signed_cookie(
+            pin_cookie_name,
+            salt=pin_cookie_salt,
+            max_age=settings.REPLICA_PIN_SECONDS,
+        )
+    except (KeyError, signing.BadSignature):
+        return False
+
+    return True
+
+
+def pin(response):
+    response.set_signed_cookie(
+        pin_cookie_name,
+        "1",
+        salt=pin_cookie_salt,
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.REPLICA_DATABASES:
+            return random.choice(settings.REPLICA_DATABASES)
+
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    # Replicas hold the same rows as the primary
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
@@ -0,0 +1,32 @@
+import django_filters
+from django.db import connections
+from django_filters.constants import EMPTY_VALUES
+
+from . import models as app_models
+
+
+class UsernameFilter(django_filters.CharFilter):
+    """
+    Case-insensitive substring search of the username of a related user,
+    given by field_name.
+    PostgreSQL serves icontains from a trigram index of the upper-cased
+    usernames. Other backends search the username tokens by prefix.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+
+        if self.distinct:
+            qs = qs.distinct()
+
+        if connections[qs.db].vendor == "postgresql":
+            lookup = {f"{self.field_name}__username__icontains": value}
+        else:
+            token = value.lower()
+            users = app_models.UsernameToken.objects.filter(
+                token__gte=token, token__lt=token + chr(0x10FFFF)
+            ).values("user")
+            lookup = {f"{self.field_name}__in": users}
+
+        return self.get_method(qs)(**lookup)
@@ -0,0 +1,95 @@
+"""
+Background verification of image URLs.
+Rows are saved with their image status pending, and a verifier requests the
+pending URLs on a thread pool, outside of any request. Only the requests run
+on the pool; the database is read and written from the calling thread.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from django.db import models
+
+from . import caching
+from .models import ImageStatus, VersionedModel
+from .validators import check_image_url
+
+
+class ImageTarget(NamedTuple):
+    model: type
+    url_field: str
+    status_field: str
+    # Response cache namespaces that include the status
+    cache_namespaces: tuple = ()
+
+
+class VerificationResult(NamedTuple):
+    verified_count: int = 0
+    failed_count: int = 0
+
+    def __add__(self, other):
+        return VerificationResult(
+            self.verified_count + other.verified_count,
+            self.failed_count + other.failed_count,
+        )
+
+
+# Verify up to batch_size pending URLs of each target. A row is only updated
+# if its URL did not change meanwhile.
+def verify_images(targets, batch_size=100, max_workers=8):
+    result = VerificationResult()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for target in targets:
+            manager = target.model._base_manager
+            rows = list(
+                manager.filter(**{target.status_field: ImageStatus.PENDING})
+                .exclude(**{target.url_field: ""})
+                .order_by("pk")
+                .values_list("pk", target.url_field)[:batch_size]
+            )
+            messages = executor.map(check_image_url, [url for _, url in rows])
+            target_result = VerificationResult()
+
+            for (pk, url), message in zip(rows, messages):
+                new_status = ImageStatus.FAILED if message else ImageStatus.VERIFIED
+                updates = {target.status_field: new_status}
+
+                if issubclass(target.model, VersionedModel):
+                    updates["version"] = models.F("version") + 1
+
+                updated = manager.filter(
+                    pk=pk,
+                    **{
+                        target.url_field: url,
+                        target.status_field: ImageStatus.PENDING,
+                    },
+                ).update(**updates)
+
+                if updated:
+                    target_result += VerificationResult(
+                        int(not message), int(bool(message))
+                    )
+
+            if target_result != VerificationResult() and target.cache_namespaces:
+                caching.invalidate(*target.cache_namespaces)
+
+            result += target_result
+
+    return result
+
+
+# Mark failed URLs as pending so that they are verified again
+def retry_failed(targets):
+    for target in targets:
+        updates = {target.status_field: ImageStatus.PENDING}
+
+        if issubclass(target.model, VersionedModel):
+            updates["version"] = models.F("version") + 1
+
+        updated = target.model._base_manager.filter(
+            **{target.status_field: ImageStatus.FAILED}
+        ).update(**updates)
+
+        if updated and target.cache_namespaces:
+            caching.invalidate(*target.cache_namespaces)
@@ -0,0 +1,24 @@
+from rest_framework import permissions
+
+from . import db_routers
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin the reads of a client to the primary database after it writes, see
+    core.db_routers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+        ):
+            db_routers.pin(response)
+
+        return response
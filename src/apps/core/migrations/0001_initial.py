@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def tokenize_usernames(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UsernameToken = apps.get_model("core", "UsernameToken")
+    tokens = []
+
+    for user_id, username in User.objects.values_list("pk", "username").iterator():
+        username = username.lower()
+        tokens += [
+            UsernameToken(user_id=user_id, token=username[i:])
+            for i in range(len(username))
+        ]
+
+        if len(tokens) >= 5000:
+            UsernameToken.objects.bulk_create(tokens)
+            tokens = []
+
+    UsernameToken.objects.bulk_create(tokens)
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UsernameToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=150)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["token", "user"], name="core_userna_token_4bde13_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(tokenize_usernames, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:10
+
+from django.conf import settings
+from django.db import migrations
+
+# Matches the expression of icontains lookups on PostgreSQL
+index_sql = (
+    "CREATE INDEX IF NOT EXISTS core_username_trgm "
+    "ON {table} USING GIN ((UPPER(username::text)) gin_trgm_ops)"
+)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(index_sql.format(table=User._meta.db_table))
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS core_username_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
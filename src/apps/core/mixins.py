@@ -0,0 +1,299 @@
+import hashlib
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.http import Http404, HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import permissions, status
+from rest_framework.response import Response
+
+from . import caching, db_routers, throttling
+
+
+class AtomicWritesMixin:
+    """
+    Run only requests of unsafe methods in a transaction. The view is exempt
+    from ATOMIC_REQUESTS and opens the transactions itself, so reads run in
+    autocommit without a transaction round trip. Writes always run in a
+    transaction of the database that writes are routed to, and of any other
+    database with ATOMIC_REQUESTS on. Error responses roll the transactions
+    back, since DRF only marks databases with ATOMIC_REQUESTS for rollback
+    when it handles an exception.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        view = super().as_view(*args, **kwargs)
+
+        for alias in connections:
+            view = transaction.non_atomic_requests(using=alias)(view)
+
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in permissions.SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+
+        aliases = [router.db_for_write(self.queryset.model)]
+        aliases += [
+            connection.alias
+            for connection in connections.all()
+            if connection.settings_dict["ATOMIC_REQUESTS"]
+            and connection.alias not in aliases
+        ]
+
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(transaction.atomic(using=alias))
+
+            response = super().dispatch(request, *args, **kwargs)
+
+            if response.status_code >= status.HTTP_400_BAD_REQUEST:
+                for alias in aliases:
+                    transaction.set_rollback(True, using=alias)
+
+            return response
+
+
+class ReplicaReadsMixin:
+    """
+    Read list and retrieve responses from a replica database unless the
+    client is pinned to the primary, see core.db_routers. Authentication and
+    permission checks read from the primary.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if self.action in self.replica_actions and not db_routers.is_pinned(request):
+            self.replica_reads_token = db_routers.replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "replica_reads_token", None)
+
+        if token is not None:
+            self.replica_reads_token = None
+            db_routers.replica_reads.reset(token)
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# The objects looked up by the views of a request, by model, lookup field and
+# value. Kept on the underlying request, so views share it.
+def get_identity_map(request):
+    request = getattr(request, "_request", request)
+
+    if not hasattr(request, "identity_map"):
+        request.identity_map = {}
+
+    return request.identity_map
+
+
+def get_identity_key(model, lookup_field, value):
+    return (model, lookup_field, str(value))
+
+
+# Add an object that is loaded already to the identity map, for views whose
+# queryset is known to include it. The object may be lazy, e.g. the user of
+# session authentication, so its model is read from its meta.
+def remember_object(request, obj):
+    key = get_identity_key(obj._meta.model, "pk", obj.pk)
+    get_identity_map(request)[key] = obj
+
+
+class IdentityMapMixin:
+    """
+    Load the object of a request at most once. Later lookups, e.g. by
+    get_serializer and then by the action, return the loaded instance, so
+    what is read or cached on it is shared too. Object permissions are still
+    checked on every lookup.
+    """
+
+    def get_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        key = get_identity_key(
+            self.get_queryset().model,
+            self.lookup_field,
+            self.kwargs[lookup_url_kwarg],
+        )
+        identity_map = get_identity_map(self.request)
+        obj = identity_map.get(key)
+
+        if obj is None:
+            obj = identity_map[key] = super().get_object()
+        else:
+            self.check_object_permissions(self.request, obj)
+
+        return obj
+
+
+class ConditionalRetrieveMixin:
+    """
+    Tag retrieved objects with a strong ETag built from their row version.
+    A retrieve with a matching If-None-Match is answered with 304 Not Modified
+    from a lookup of the version alone, without loading or serializing the
+    object.
+    """
+
+    version_field = "version"
+
+    def retrieve(self, request, *args, **kwargs):
+        if_none_match = request.headers.get("If-None-Match")
+
+        if if_none_match:
+            etag = self.get_etag(self.get_object_version())
+            etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+
+            if "*" in etags or etag in etags:
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        etag = self.get_etag(getattr(instance, self.version_field))
+        return Response(serializer.data, headers={"ETag": etag})
+
+    def get_object_version(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .prefetch_related(None)
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        )
+        version = queryset.values_list(self.version_field, flat=True).first()
+
+        if version is None:
+            raise Http404
+
+        return version
+
+    # The query string and renderer are part of the tag because they change
+    # the representation of the same version.
+    def get_etag(self, version):
+        representation = repr(
+            (
+                self.request.accepted_renderer.format,
+                sorted(self.request.query_params.lists()),
+            )
+        )
+        digest = hashlib.md5(representation.encode(), usedforsecurity=False)
+        return quote_etag(f"{version}-{digest.hexdigest()[:16]}")
+
+
+class CachedReadMixin:
+    """
+    Serve list and retrieve responses from the response cache.
+    Responses are cached after rendering, so a hit skips the queryset and
+    serialization entirely. Only JSON is cached, since the browsable API
+    renders user specific forms. Conditional requests bypass the cache so
+    they are answered from the row version. Responses read from a replica are
+    served from the cache but not cached.
+    Writes that change what a namespace returns must invalidate it.
+    """
+
+    cache_namespace = None
+    cached_headers = ("ETag",)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response() or super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response() or super().retrieve(request, *args, **kwargs)
+
+    def get_cached_response(self):
+        self.response_key = None
+
+        if (
+            self.request.accepted_renderer.format != "json"
+            or "If-None-Match" in self.request.headers
+        ):
+            return None
+
+        self.response_key = caching.get_response_key(self.request, self.cache_namespace)
+        cached = caching.get_cache().get(self.response_key)
+
+        if cached is None:
+            # A replica may lag behind the generation of the key, so responses
+            # read from one are not cached, see ReplicaReadsMixin
+            if db_routers.replica_reads.get() and settings.REPLICA_DATABASES:
+                self.response_key = None
+
+            return None
+
+        content, content_type, headers = cached
+        response = HttpResponse(content, content_type=content_type)
+
+        for header, value in headers.items():
+            response[header] = value
+
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        response_key = getattr(self, "response_key", None)
+
+        if (
+            response_key is not None
+            and isinstance(response, Response)
+            and response.status_code == status.HTTP_200_OK
+        ):
+            response.add_post_render_callback(
+                lambda rendered: self.cache_response(response_key, rendered)
+            )
+
+        return response
+
+    def cache_response(self, response_key, response):
+        headers = {
+            header: response[header]
+            for header in self.cached_headers
+            if header in response
+        }
+        caching.get_cache().set(
+            response_key,
+            (response.content, response["Content-Type"], headers),
+            settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+
+class TokenBucketThrottleMixin:
+    """
+    Take tokens from the token bucket throttles of a request once they all
+    allow it, and report their remaining budget in X-RateLimit headers, see
+    core.throttling. The throttle with the least remaining budget is reported.
+    """
+
+    def get_throttles(self):
+        self.throttles = super().get_throttles()
+        return self.throttles
+
+    def check_throttles(self, request):
+        super().check_throttles(request)
+
+        for throttle in self.throttles:
+            if isinstance(throttle, throttling.TokenBucketThrottle):
+                throttle.consume()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        throttles = [
+            throttle
+            for throttle in getattr(self, "throttles", ())
+            if getattr(throttle, "tokens", None) is not None
+        ]
+
+        if throttles:
+            throttle = min(
+                throttles,
+                key=lambda throttle: (throttle.get_remaining(), -throttle.get_reset()),
+            )
+            response["X-RateLimit-Limit"] = throttle.num_requests
+            response["X-RateLimit-Remaining"] = throttle.get_remaining()
+            response["X-RateLimit-Reset"] = throttle.get_reset()
+
+        return response
@@ -1,9 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save
-from factory import Faker, LazyFunction, RelatedFactory
+from factory import Faker, LazyFunction, RelatedFactory, post_generation
 from factory.django import DjangoModelFactory, Password, mute_signals
 
 from ..profiles.model_factories import ProfileFactory
+from .models import UsernameToken
 
 User = get_user_model()
 
@@ -23,3 +24,9 @@ class UserFactory(DjangoModelFactory):
         factory_related_name="owner",
         followers=LazyFunction(lambda: User.objects.filter(is_superuser=False)),
     )
+
+    # Username tokens are otherwise created by the muted signal
+    @post_generation
+    def username_tokens(self, create, extracted, **kwargs):
+        if create:
+            UsernameToken.set_tokens(self)
@@ -0,0 +1,260 @@
+from django.conf import settings
+from django.db import models
+
+
+class VersionedModel(models.Model):
+    """
+    A model with a row version that is incremented in SQL on every update.
+    Writes that change the representation of a row without saving it
+    (e.g. counter and M2M updates) must increment the version too.
+    """
+
+    class Meta:
+        abstract = True
+
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        self.version = models.F("version") + 1
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+
+        super().save(*args, **kwargs)
+        # Defer the new version so that it is only reloaded when accessed
+        del self.__dict__["version"]
+
+
+class TrackedFieldsModel(models.Model):
+    """
+    A model that remembers the values of its tracked fields as last loaded
+    from or saved to the database, so a save can tell what changed.
+    Relations are tracked by their stored key.
+    """
+
+    class Meta:
+        abstract = True
+
+    tracked_fields = ()
+    # Tracked fields that are expensive to validate, so only when they change
+    validate_changed_only = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+
+    # Instances that were not loaded with the field read the stored value
+    def get_loaded_value(self, field_name):
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        if field_name in loaded_values:
+            return loaded_values[field_name]
+
+        return (
+            type(self)
+            ._base_manager.filter(pk=self.pk)
+            .values_list(self._meta.get_field(field_name).attname, flat=True)
+            .first()
+        )
+
+    def has_changed(self, field_name):
+        attname = self._meta.get_field(field_name).attname
+        return getattr(self, attname) != self.get_loaded_value(field_name)
+
+    def full_clean(self, exclude=None, validate_unique=True, validate_constraints=True):
+        exclude = set(exclude or ())
+
+        if not self._state.adding:
+            exclude.update(
+                field_name
+                for field_name in self.validate_changed_only
+                if not self.has_changed(field_name)
+            )
+
+        # Kept so that clean can skip checks of excluded fields
+        self._clean_exclude = exclude
+        super().full_clean(exclude, validate_unique, validate_constraints)
+
+    def is_cleaned(self, field_name):
+        return field_name not in getattr(self, "_clean_exclude", ())
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._remember_tracked_fields(kwargs.get("update_fields"))
+
+    def _remember_tracked_fields(self, update_fields=None):
+        if not hasattr(self, "_loaded_values"):
+            self._loaded_values = {}
+
+        for field_name in self.tracked_fields:
+            field = self._meta.get_field(field_name)
+
+            if field.attname in self.__dict__ and (
+                update_fields is None
+                or field.name in update_fields
+                or field.attname in update_fields
+            ):
+                self._loaded_values[field_name] = self.__dict__[field.attname]
+
+
+class CleanOnSaveModel(TrackedFieldsModel):
+    """
+    A model that is cleaned on every save, as far as the save requires.
+    Only the fields in update_fields are cleaned. Related objects that clean
+    reads are loaded once, with only the fields it reads, and that load also
+    validates their keys. Related objects that are already loaded (e.g.
+    resolved by a serializer) are not looked up again.
+    """
+
+    class Meta:
+        abstract = True
+
+    # Relations read by clean, mapped to the fields it reads of them.
+    # Fields of relations of the related object are selected along with it.
+    clean_related_fields = {}
+
+    def clean_on_save(self, update_fields=None):
+        exclude = None
+
+        if update_fields is not None:
+            exclude = [
+                field.name
+                for field in self._meta.concrete_fields
+                if field.name not in update_fields
+                and field.attname not in update_fields
+            ]
+
+        self.full_clean(exclude=exclude)
+
+    def clean_fields(self, exclude=None):
+        exclude = set(exclude or ())
+
+        for field_name in self.clean_related_fields:
+            if field_name not in exclude:
+                self.get_related(field_name)
+
+        # A loaded related object exists, so its key needs no lookup
+        exclude.update(
+            field.name
+            for field in self._meta.concrete_fields
+            if field.is_relation
+            and field.is_cached(self)
+            and field.get_cached_value(self) is not None
+        )
+        super().clean_fields(exclude=exclude)
+
+    # The related object, loaded with only the fields clean reads if not
+    # loaded yet. None if the key is null or refers to no row.
+    def get_related(self, field_name):
+        field = self._meta.get_field(field_name)
+
+        if not field.is_cached(self):
+            related = None
+            related_pk = getattr(self, field.attname)
+
+            if related_pk is not None:
+                field_names = self.clean_related_fields.get(field_name, ())
+                relations = {
+                    name.rsplit("__", 1)[0] for name in field_names if "__" in name
+                }
+                related = (
+                    field.related_model._base_manager.select_related(*relations)
+                    .only(*relations, *field_names)
+                    .filter(pk=related_pk)
+                    .first()
+                )
+
+            field.set_cached_value(self, related)
+
+        return field.get_cached_value(self)
+
+
+class ImageStatus(models.TextChoices):
+    PENDING = "pending"
+    VERIFIED = "verified"
+    FAILED = "failed"
+
+
+class VerifiedImagesModel(TrackedFieldsModel):
+    """
+    A model with image URLs that are verified in the background, see
+    core.images. Saving a new URL resets its status to pending.
+    """
+
+    class Meta:
+        abstract = True
+
+    # Image URL field names mapped to their status field names
+    verified_image_fields = {}
+
+    def has_image_changed(self, url_field):
+        if self._state.adding:
+            return True
+
+        return getattr(self, url_field) != self.get_loaded_value(url_field)
+
+    # The status of an image as of the next save, which resets it if the URL
+    # changed, so e.g. clean can check it before the save
+    def get_image_status(self, url_field):
+        status_field = self.verified_image_fields[url_field]
+
+        if not self.has_image_changed(url_field):
+            return getattr(self, status_field)
+
+        # There is nothing to verify without a URL
+        return ImageStatus.PENDING if getattr(self, url_field) else ImageStatus.VERIFIED
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        for url_field, status_field in self.verified_image_fields.items():
+            if update_fields is not None and url_field not in update_fields:
+                continue
+
+            if self.has_image_changed(url_field):
+                setattr(self, status_field, self.get_image_status(url_field))
+
+                if update_fields is not None:
+                    update_fields = {*update_fields, status_field}
+
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+
+        super().save(*args, **kwargs)
+
+
+class UsernameToken(models.Model):
+    """
+    A lowercase suffix of a username.
+    Every substring of a username is a prefix of one of its suffixes, so a
+    case-insensitive substring search of usernames is an indexed range scan
+    of the tokens. Searched in place of a trigram index on backends other
+    than PostgreSQL.
+    """
+
+    class Meta:
+        indexes = [models.Index(fields=["token", "user"])]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    token = models.CharField(max_length=150)
+
+    @staticmethod
+    def tokenize(username):
+        username = username.lower()
+        return [username[i:] for i in range(len(username))]
+
+    @classmethod
+    def set_tokens(cls, user):
+        cls.objects.filter(user=user).delete()
+        cls.objects.bulk_create(
+            [cls(user=user, token=token) for token in cls.tokenize(user.username)]
+        )
@@ -0,0 +1,277 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from typing import NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.template import loader
+from django.utils.translation import gettext_lazy as _
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class OrderingKey(NamedTuple):
+    field: str
+    descending: bool
+    nullable: bool
+    nulls_last: bool = True
+
+    def reversed(self):
+        return self._replace(
+            descending=not self.descending, nulls_last=not self.nulls_last
+        )
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Cursor pagination that seeks on every field of the queryset ordering.
+    The primary key is appended to the ordering as a tiebreaker, so positions
+    are unique and no count or offset query is needed.
+    Nulls are ordered last, so they come first when paging backwards.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = _("Invalid cursor")
+    template = "rest_framework/pagination/previous_and_next.html"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+
+        if reverse:
+            ordering = [key.reversed() for key in ordering]
+
+        queryset = queryset.order_by(*[self._order_expression(key) for key in ordering])
+
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, position))
+
+        # Fetch an extra row to know whether another page follows
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        self.page = results
+        self.display_page_controls = self.has_next or self.has_previous
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self._get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(self._get_position(self.page[0]), reverse=True)
+
+    def get_html_context(self):
+        return {
+            "previous_url": self.get_previous_link(),
+            "next_url": self.get_next_link(),
+        }
+
+    def to_html(self):
+        template = loader.get_template(self.template)
+        context = self.get_html_context()
+        return template.render(context)
+
+    def get_ordering(self, queryset):
+        model = queryset.model
+        ordering = []
+
+        for field in queryset.query.order_by:
+            if not isinstance(field, str):
+                raise TypeError("Keyset pagination requires field name orderings.")
+
+            descending = field.startswith("-")
+            field = field.lstrip("-")
+
+            if field in ("pk", model._meta.pk.name):
+                break
+
+            # Annotations, such as a search rank, are taken to be non-null
+            if field in queryset.query.annotations:
+                nullable = False
+            else:
+                nullable = self._is_nullable(model, field)
+
+            ordering.append(OrderingKey(field, descending, nullable))
+
+        return [*ordering, OrderingKey("pk", False, False)]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if not encoded:
+            return None, False
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(encoded + padding))
+            position = cursor["p"]
+            reverse = bool(cursor.get("r", False))
+        except (Base64Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {"p": position}
+
+        if reverse:
+            cursor["r"] = 1
+
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        )
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode().rstrip("=")
+        )
+
+    def _is_nullable(self, model, field):
+        nullable = False
+
+        for name in field.split("__"):
+            model_field = model._meta.get_field(name)
+            nullable = nullable or model_field.null
+
+            if model_field.is_relation:
+                model = model_field.related_model
+
+        return nullable
+
+    def _get_position(self, instance):
+        position = []
+
+        for key in self.ordering:
+            value = instance
+            *relations, attr = key.field.split("__")
+
+            for relation in relations:
+                value = getattr(value, relation)
+
+            # Use the stored key of a relation rather than the related object
+            if value is not None and attr != "pk":
+                try:
+                    model_field = value._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    # An annotation
+                    model_field = None
+
+                if model_field is not None and model_field.is_relation:
+                    attr = model_field.attname
+
+            position.append(None if value is None else getattr(value, attr))
+
+        return json.loads(json.dumps(position, cls=DjangoJSONEncoder))
+
+    def _order_expression(self, key):
+        if key.nulls_last:
+            nulls = {"nulls_last": True}
+        else:
+            nulls = {"nulls_first": True}
+
+        if key.descending:
+            return models.F(key.field).desc(**nulls)
+
+        return models.F(key.field).asc(**nulls)
+
+    # Rows after the position are those that match it on a prefix of the
+    # ordering and then move past it on the next field.
+    def _seek_filter(self, ordering, position):
+        nothing = models.Q(pk__in=[])
+        seek_filter = nothing
+        equal_prefix = models.Q()
+
+        for key, value in zip(ordering, position):
+            is_null = models.Q(**{f"{key.field}__isnull": True})
+
+            if value is None:
+                past = nothing if key.nulls_last else ~is_null
+                equal = is_null
+            else:
+                lookup = "lt" if key.descending else "gt"
+                past = models.Q(**{f"{key.field}__{lookup}": value})
+                equal = models.Q(**{key.field: value})
+
+                if key.nullable and key.nulls_last:
+                    past |= is_null
+
+            seek_filter |= equal_prefix & past
+            equal_prefix &= equal
+
+        return seek_filter
+
+
+class CursorOptInPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination, unless the client opts in to keyset pagination
+    by passing the cursor query parameter (empty for the first page).
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            page = self.keyset.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.keyset.display_page_controls
+            return page
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+
+        return super().to_html()
@@ -1,5 +1,7 @@
 from rest_framework import permissions as perms
 
+from . import roles
+
 
 class ReadOnly(perms.BasePermission):
     def has_permission(self, request, view):
@@ -13,12 +15,13 @@ class IsCurrentUser(perms.BasePermission):
 
 class IsOwner(perms.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        # Compared by key, so the owner is not loaded
+        return obj.owner_id == request.user.pk
 
 
 class IsModerator(perms.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.groups.filter(name="moderator").exists()
+        return roles.has_role(request.user, "moderator")
 
 
 class IsGroupModerator(IsModerator):
@@ -30,7 +33,7 @@ class IsGroupModerator(IsModerator):
         if not only_groups:
             return False
 
-        groups = obj.groups.values_list("name", flat=True)
+        groups = roles.get_roles(obj)
         mod_group_name = "moderator"
         mod_in_request_data = mod_group_name in request.data["groups"]
         mod_in_groups = mod_group_name in groups
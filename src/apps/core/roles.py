@@ -0,0 +1,119 @@
+"""
+The roles of a user, i.e. the names of their groups.
+Roles are loaded once per request and memoized in process by user id and
+membership version. The version is a pair of tokens in the shared cache, one
+of the user and one of all groups, replaced when the groups of the user change
+or a group is renamed or deleted, see core.signals. Without a shared cache
+that keeps the tokens, roles are loaded once per request.
+The user token is also replaced when the credentials of the user change, so
+the version doubles as the auth version of access tokens, see
+core.authentication.
+"""
+
+import secrets
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import transaction
+
+groups_version_key = "role-version:groups"
+
+
+def get_user_version_key(user_id):
+    return f"role-version:user:{user_id}"
+
+
+def get_version(user_id):
+    cache = caches["shared"]
+    keys = [get_user_version_key(user_id), groups_version_key]
+    version = cache.get_many(keys)
+
+    for key in keys:
+        if key not in version:
+            # Another process may have set the token in the meantime
+            cache.add(key, secrets.token_hex(8), None)
+
+    if len(version) < len(keys):
+        version = cache.get_many(keys)
+
+    if len(version) < len(keys):
+        return None
+
+    return tuple(version[key] for key in keys)
+
+
+# The version as last read by this process, read again every
+# AUTH_VERSION_CACHE_SECONDS, or on every call if that is 0
+def get_cached_version(user_id):
+    if not settings.AUTH_VERSION_CACHE_SECONDS:
+        return get_version(user_id)
+
+    period = int(time.monotonic() // settings.AUTH_VERSION_CACHE_SECONDS)
+    return _get_version_of_period(user_id, period)
+
+
+@lru_cache(maxsize=settings.ROLE_CACHE_SIZE)
+def _get_version_of_period(user_id, period):
+    return get_version(user_id)
+
+
+# The version as a token claim, None if there is none
+def format_version(version):
+    return ":".join(version) if version is not None else None
+
+
+def _replace_versions(keys):
+    caches["shared"].set_many({key: secrets.token_hex(8) for key in keys}, None)
+    # This process reads the new versions at once, others within a period
+    _get_version_of_period.cache_clear()
+
+
+# Pass no user ids to invalidate the roles of all users. Replaced now, so the
+# writer reads its own writes, and again on commit, so a version read by a
+# concurrent request before the commit is dropped too.
+def invalidate(user_ids=None):
+    if user_ids is None:
+        keys = [groups_version_key]
+    else:
+        keys = [get_user_version_key(user_id) for user_id in user_ids]
+
+    if keys:
+        _replace_versions(keys)
+        transaction.on_commit(lambda: _replace_versions(keys), robust=True)
+
+
+def _load_roles(user_id):
+    return frozenset(Group.objects.filter(user=user_id).values_list("name", flat=True))
+
+
+# Entries of stale versions are never hit again and age out
+@lru_cache(maxsize=settings.ROLE_CACHE_SIZE)
+def _load_roles_of_version(user_id, version):
+    return _load_roles(user_id)
+
+
+# The user instance is per request, so the roles are memoized on it
+def get_roles(user):
+    if not user or not user.is_authenticated:
+        return frozenset()
+
+    roles = getattr(user, "_roles", None)
+
+    if roles is None:
+        version = get_version(user.pk)
+
+        if version is None:
+            roles = _load_roles(user.pk)
+        else:
+            roles = _load_roles_of_version(user.pk, version)
+
+        user._roles = roles
+
+    return roles
+
+
+def has_role(user, role):
+    return role in get_roles(user)
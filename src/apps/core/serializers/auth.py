@@ -1,12 +1,16 @@
 from django.contrib.auth.models import Group, User
 from djoser.serializers import UserSerializer
 from rest_framework import serializers as serials
+from rest_framework_simplejwt import serializers as jwt_serials
 
+from .. import roles
+from ..authentication import auth_version_claim
+from . import base as base_serials
 from .mixins import DynamicFieldsMixin
 
 
 class UserSerializer(DynamicFieldsMixin, UserSerializer):
-    groups = serials.SlugRelatedField(
+    groups = base_serials.SlugRelatedField(
         many=True, queryset=Group.objects.all(), slug_field="name"
     )
 
@@ -19,3 +23,22 @@ class GroupSerializer(serials.ModelSerializer):
     class Meta:
         model = Group
         fields = ["id", "name"]
+
+
+# Tokens of the jwt-create route, with the claims that the user is built from
+# by core.authentication.StatelessJWTAuthentication
+class TokenObtainPairSerializer(jwt_serials.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Read before the roles, so a change in between makes the token stale
+        version = roles.format_version(roles.get_version(user.pk))
+        token["username"] = user.username
+        token["roles"] = sorted(roles.get_roles(user))
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+
+        if version is not None:
+            token[auth_version_claim] = version
+
+        return token
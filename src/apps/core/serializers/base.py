@@ -1,10 +1,110 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import relations
 from rest_framework import serializers as serials
 from rest_framework.utils import field_mapping
 
 
-class HyperlinkedReprnRelatedField(serials.HyperlinkedRelatedField):
+class BatchedManyRelatedField(relations.ManyRelatedField):
+    """
+    A many relation that resolves all of its values with one IN query of the
+    lookup field of its child, see BatchedRelatedFieldMixin. Errors are
+    reported by the index of each value that fails.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        lookup_field = child.get_lookup_model_field()
+        lookup_values = {}
+        errors = {}
+
+        for index, item in enumerate(data):
+            try:
+                lookup_values[index] = child.to_lookup_value(item)
+            except serials.ValidationError as error:
+                errors[index] = error.detail
+
+        objects = {
+            getattr(obj, lookup_field.attname): obj
+            for obj in child.get_queryset().filter(
+                **{f"{lookup_field.name}__in": set(lookup_values.values())}
+            )
+        }
+
+        for index, item in enumerate(data):
+            if index in lookup_values and lookup_values[index] not in objects:
+                try:
+                    child.fail_does_not_exist(item)
+                except serials.ValidationError as error:
+                    errors[index] = error.detail
+
+        if errors:
+            raise serials.ValidationError(errors)
+
+        return [objects[lookup_values[index]] for index in range(len(data))]
+
+
+class BatchedRelatedFieldMixin:
+    """
+    A related field whose many relations are resolved in one query, see
+    BatchedManyRelatedField. Values are looked up by a concrete field of the
+    related model, see get_lookup_field_name.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+
+        for key in kwargs:
+            if key in relations.MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+
+        return BatchedManyRelatedField(**list_kwargs)
+
+    # The lookup field of the field, e.g. of hyperlinked fields, and the
+    # primary key for fields without one
+    def get_lookup_field_name(self):
+        return getattr(self, "lookup_field", "pk")
+
+    def get_lookup_model_field(self):
+        opts = self.get_queryset().model._meta
+        field_name = self.get_lookup_field_name()
+        return opts.pk if field_name == "pk" else opts.get_field(field_name)
+
+    # The value as stored, so it can be matched with the loaded objects
+    def to_lookup_value(self, data):
+        try:
+            return self.get_lookup_model_field().to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            self.fail_invalid(data)
+
+    def fail_invalid(self, data):
+        self.fail_does_not_exist(data)
+
+    def fail_does_not_exist(self, data):
+        self.fail("does_not_exist")
+
+
+class SlugRelatedField(BatchedRelatedFieldMixin, serials.SlugRelatedField):
+    def get_lookup_field_name(self):
+        return self.slug_field
+
+    def fail_invalid(self, data):
+        self.fail("invalid")
+
+    def fail_does_not_exist(self, data):
+        self.fail("does_not_exist", slug_name=self.slug_field, value=str(data))
+
+
+class HyperlinkedReprnRelatedField(
+    BatchedRelatedFieldMixin, serials.HyperlinkedRelatedField
+):
     def to_internal_value(self, data):
         try:
             return self.get_object(
@@ -1,3 +1,4 @@
+from django.db import models
 from rest_framework import serializers as serials
 
 
@@ -16,6 +17,8 @@ class ImmutableFieldsMixin(serials.ModelSerializer):
             for field_name in immutable_fields:
                 kwargs = extra_kwargs.get(field_name, {})
                 kwargs["read_only"] = True
+                # Read only relations must not have a queryset
+                kwargs.pop("queryset", None)
                 extra_kwargs[field_name] = kwargs
 
         return extra_kwargs
@@ -35,3 +38,41 @@ class DynamicFieldsMixin(serials.ModelSerializer):
             existing = set(self.fields)
             for field_name in existing - allowed:
                 self.fields.pop(field_name)
+
+
+class ChangedOnlyValidator:
+    """
+    Wrap a field validator so that it is skipped when the value is that of
+    the instance being updated.
+    """
+
+    requires_context = True
+
+    def __init__(self, validator):
+        self.validator = validator
+
+    def __call__(self, value, serializer_field):
+        instance = getattr(serializer_field.parent, "instance", None)
+
+        if isinstance(instance, models.Model) and value == (
+            serializer_field.get_attribute(instance)
+        ):
+            return
+
+        if getattr(self.validator, "requires_context", False):
+            self.validator(value, serializer_field)
+        else:
+            self.validator(value)
+
+
+class ChangedOnlyValidationMixin(serials.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+
+        for field_name in getattr(self.Meta, "validate_changed_only", ()):
+            field = fields[field_name]
+            field.validators = [
+                ChangedOnlyValidator(validator) for validator in field.validators
+            ]
+
+        return fields
@@ -1,11 +1,127 @@
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 
+from . import models as app_models
+from . import roles
+
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def assign_default_groups(sender, instance, created, **kwargs):
     if created:
         commenter_group = Group.objects.get(name="commenter")
         instance.groups.add(commenter_group)
+
+
+"""
+Track whether a save changes the username of a user, compared to the username
+as loaded or last saved, for receivers of the save that depend on it. A user
+that was loaded without its username compares to the stored one.
+"""
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_username(sender, instance, **kwargs):
+    instance._saved_username = instance.__dict__.get("username")
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def track_username_change(sender, instance, update_fields, **kwargs):
+    instance._username_changed = False
+
+    if instance._state.adding or (
+        update_fields is not None and "username" not in update_fields
+    ):
+        return
+
+    saved_username = getattr(instance, "_saved_username", None)
+
+    if saved_username is None:
+        saved_username = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+    instance._username_changed = instance.username != saved_username
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def remember_saved_username(sender, instance, update_fields, **kwargs):
+    if update_fields is None or "username" in update_fields:
+        instance._saved_username = instance.username
+
+
+# Whether the save of the user being saved changes their username
+def username_changed(user):
+    return getattr(user, "_username_changed", False)
+
+
+"""
+Keep the username tokens of a user in sync with their username.
+"""
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_username_tokens(sender, instance, created, update_fields, **kwargs):
+    if not created:
+        if update_fields is not None and "username" not in update_fields:
+            return
+
+        # The whole username is a token, so it is unchanged if that exists
+        if app_models.UsernameToken.objects.filter(
+            user=instance, token=instance.username.lower()
+        ).exists():
+            return
+
+    app_models.UsernameToken.set_tokens(instance)
+
+
+"""
+Invalidate memoized roles when group memberships or groups change, see
+core.roles.
+"""
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_member_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        roles.invalidate([instance.pk])
+    elif pk_set is None:
+        # The members of a cleared group are unknown
+        roles.invalidate()
+    else:
+        roles.invalidate(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_roles(sender, **kwargs):
+    roles.invalidate()
+
+
+# The auth version of a user changes with their credentials and claims, see
+# core.authentication
+auth_fields = {"username", "password", "is_active", "is_staff", "is_superuser"}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_auth(sender, instance, created, update_fields, **kwargs):
+    if not created and (update_fields is None or auth_fields & set(update_fields)):
+        roles.invalidate([instance.pk])
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_deleted_user_auth(sender, instance, **kwargs):
+    roles.invalidate([instance.pk])
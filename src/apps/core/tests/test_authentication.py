@@ -0,0 +1,133 @@
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .. import model_factories as core_factories
+from .. import roles
+from ..authentication import StatelessJWTAuthentication
+from . import utils as test_utils
+
+
+def get_auth_queries(context):
+    # The profiler explains the queries of a request
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("SELECT")
+        and ('FROM "auth_user"' in query["sql"] or '"auth_group"' in query["sql"])
+    ]
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "authentication-test",
+        },
+        "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+)
+class StatelessJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        roles._load_roles_of_version.cache_clear()
+        roles._get_version_of_period.cache_clear()
+        self.user1 = core_factories.UserFactory()
+        self.author_group = Group.objects.create(name="author")
+        self.user1.groups.add(self.author_group)
+        self.url = reverse("tag-list")
+        return super().setUp()
+
+    def get_access_token(self):
+        res = self.client.post(
+            reverse("jwt-create"),
+            {"username": self.user1.username, "password": "password"},
+        )
+        return AccessToken(res.json()["access"])
+
+    def test_token_claims(self):
+        token = self.get_access_token()
+
+        self.assertEqual(token["user_id"], str(self.user1.pk))
+        self.assertEqual(token["username"], self.user1.username)
+        self.assertEqual(token["roles"], ["author"])
+        self.assertFalse(token["is_staff"])
+        self.assertEqual(
+            token["auth_version"],
+            roles.format_version(roles.get_version(self.user1.pk)),
+        )
+
+    def test_token_user(self):
+        token = self.get_access_token()
+
+        with CaptureQueriesContext(connection) as context:
+            user = StatelessJWTAuthentication().get_user(token)
+
+        self.assertEqual(context.captured_queries, [])
+        self.assertEqual(user, self.user1)
+        self.assertEqual(user.username, self.user1.username)
+        self.assertEqual(roles.get_roles(user), {"author"})
+
+    def test_current_token_without_queries(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(reverse("post-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_auth_queries(context), [])
+
+    def test_write_loads_user(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        # A change the token is not stale for yet, e.g. on another process
+        User.objects.filter(pk=self.user1.pk).update(is_staff=True)
+
+        res = self.client.patch(reverse("user-me"), {"email": "new@email.com"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user1.refresh_from_db()
+        self.assertEqual(self.user1.email, "new@email.com")
+        self.assertTrue(self.user1.is_staff)
+
+    def test_stale_token_after_group_change(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        self.user1.groups.remove(self.author_group)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.url, {"title": "wahoo"})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stale_token_after_user_delete(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        self.user1.delete()
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.url, {"title": "wahoo"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_VERSION_CACHE_SECONDS=0)
+    def test_stale_token_without_version_memo(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        res = self.client.post(self.url, {"title": "wahoo"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.user1.groups.remove(self.author_group)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.url, {"title": "wahoo2"})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_token_user_loads_deferred_fields(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        res = self.client.get(reverse("user-me"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user1.email)
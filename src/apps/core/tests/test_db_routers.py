@@ -0,0 +1,84 @@
+from django.contrib.auth.models import Group
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+from .. import db_routers
+from .. import model_factories as core_factories
+from . import utils as test_utils
+
+
+# The primary and the replica are separate SQLite files, so rows written to
+# one are not read from the other
+@override_settings(REPLICA_DATABASES=["replica"], REPLICA_PIN_SECONDS=60)
+class ReplicaRouterTest(APITestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.user1 = core_factories.UserFactory()
+        self.user1.groups.add(Group.objects.create(name="author"))
+        self.primary_tag = posts_factories.TagFactory()
+        self.url = reverse("tag-list")
+        return super().setUp()
+
+    def get_titles(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [tag["title"] for tag in res.json()["results"]]
+
+    def test_list_retrieve_read_replica(self):
+        replica_tag = posts_models.Tag.objects.using("replica").create(
+            pk=self.primary_tag.pk + 1, title="replicated"
+        )
+        self.assertEqual(self.get_titles(), ["replicated"])
+
+        res = self.client.get(reverse("tag-detail", kwargs={"pk": replica_tag.pk}))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(
+                reverse("tag-detail", kwargs={"pk": self.primary_tag.pk})
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_write_pins_primary(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        res = self.client.post(self.url, {"title": "wahoo"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn(db_routers.pin_cookie_name, res.cookies)
+        self.assertEqual(self.get_titles(), [self.primary_tag.title, "wahoo"])
+
+    def test_pin_expires(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        self.client.post(self.url, {"title": "wahoo"})
+
+        with override_settings(REPLICA_PIN_SECONDS=-1):
+            self.assertEqual(self.get_titles(), [])
+
+    def test_pin_forged(self):
+        self.client.cookies[db_routers.pin_cookie_name] = "1"
+        self.assertEqual(self.get_titles(), [])
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+            "shared": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+            "responses": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "replica-router-test",
+            },
+        }
+    )
+    def test_replica_reads_not_cached(self):
+        self.assertEqual(self.get_titles(), [])
+
+        # The replica catches up
+        posts_models.Tag.objects.using("replica").create(
+            pk=self.primary_tag.pk, title=self.primary_tag.title
+        )
+        self.assertEqual(self.get_titles(), [self.primary_tag.title])
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+from .. import model_factories as core_factories
+from .. import models as core_models
+from . import utils as test_utils
+
+User = get_user_model()
+
+
+class UsernameFilterTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory(username="AdaLovelace")
+        self.user2 = core_factories.UserFactory(username="alan_turing")
+        self.post1 = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.post2 = posts_factories.PostFactory(
+            owner=self.user2,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.url = reverse("post-list")
+        return super().setUp()
+
+    def get_owner_ids(self, owner):
+        res = self.client.get(self.url, {"owner": owner})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {test_utils.last_url_pk(post["url"]) for post in res.data["results"]}
+
+    def test_filter_substring(self):
+        self.assertEqual(self.get_owner_ids("LOVE"), {self.post1.id})
+        self.assertEqual(self.get_owner_ids("a"), {self.post1.id, self.post2.id})
+        self.assertEqual(self.get_owner_ids("_tur"), {self.post2.id})
+        self.assertEqual(self.get_owner_ids("grace"), set())
+
+    def test_tokens_on_rename(self):
+        self.user2.username = "GraceHopper"
+        self.user2.save()
+
+        self.assertEqual(self.get_owner_ids("turing"), set())
+        self.assertEqual(self.get_owner_ids("hopper"), {self.post2.id})
+
+        # Unrelated updates leave the tokens alone
+        self.user2.save(update_fields=["last_login"])
+        tokens = core_models.UsernameToken.objects.filter(user=self.user2)
+        self.assertEqual(
+            sorted(tokens.values_list("token", flat=True)),
+            sorted(core_models.UsernameToken.tokenize("GraceHopper")),
+        )
+
+    def test_tokens_on_create(self):
+        # Required by the assignment of default groups
+        Group.objects.create(name="commenter")
+        user = User.objects.create_user(username="Radia", password="password")
+        self.assertTrue(
+            core_models.UsernameToken.objects.filter(user=user, token="dia").exists()
+        )
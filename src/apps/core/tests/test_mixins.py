@@ -0,0 +1,148 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.test import APITestCase
+
+from ...posts.models import Tag
+from .. import model_factories as core_factories
+from . import utils as test_utils
+
+
+class AtomicWritesMixinTest(APITestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.user1.groups.add(Group.objects.create(name="author"))
+        self.url = reverse("tag-list")
+        return super().setUp()
+
+    # Tests run in a transaction, so a request transaction is a savepoint
+    # made before the first query of the view. The profiler queries around
+    # the view are skipped.
+    def get_request_savepoints(self, context):
+        savepoints = []
+
+        for query in context.captured_queries:
+            if "silk_" in query["sql"]:
+                continue
+
+            if not query["sql"].startswith("SAVEPOINT"):
+                break
+
+            savepoints.append(query["sql"])
+
+        return savepoints
+
+    def test_read_in_autocommit(self):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_request_savepoints(context), [])
+
+    def test_write_in_transaction(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.post(self.url, {"title": "wahoo"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.get_request_savepoints(context)), 1)
+
+    def test_write_in_transaction_without_atomic_requests(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        with (
+            mock.patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": False}),
+            CaptureQueriesContext(connection) as context,
+        ):
+            res = self.client.post(self.url, {"title": "wahoo"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.get_request_savepoints(context)), 1)
+
+    def test_write_rolled_back_on_handled_error(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        def save_then_fail(view, serializer):
+            serializer.save()
+            raise exceptions.ValidationError("wahoo")
+
+        with (
+            mock.patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": False}),
+            mock.patch(
+                "apps.posts.views.TagViewSet.perform_create",
+                autospec=True,
+                side_effect=save_then_fail,
+            ),
+            self.assertLogs("django.request", level="WARNING"),
+        ):
+            res = self.client.post(self.url, {"title": "wahoo"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.filter(title="wahoo").exists())
+
+
+class IdentityMapMixinTest(APITestCase):
+    def setUp(self):
+        Group.objects.create(name="commenter")
+        self.moderator_group = Group.objects.create(name="moderator")
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.user2.groups.add(self.moderator_group)
+        self.url = reverse("user-detail", kwargs={"pk": self.user1.pk})
+        return super().setUp()
+
+    # The profiler explains the queries of a request
+    def get_user_loads(self, context, user):
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "auth_user"' in query["sql"]
+            and f'"auth_user"."id" = {user.pk}' in query["sql"]
+        ]
+
+    def test_get_loads_object_once(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.get_user_loads(context, self.user1)), 1)
+
+    def test_patch_loads_object_once(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.patch(self.url, {"groups": ["commenter"]})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.get_user_loads(context, self.user1)), 1)
+
+    def test_get_current_user_loads_only_user(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # The user is loaded by authentication alone
+        self.assertEqual(len(self.get_user_loads(context, self.user1)), 1)
+
+    def test_get_current_session_user_loads_only_user(self):
+        self.client.force_login(self.user1)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.get_user_loads(context, self.user1)), 1)
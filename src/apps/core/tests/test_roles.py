@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser, Group
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...posts import model_factories as posts_factories
+from .. import model_factories as core_factories
+from .. import roles
+from . import utils as test_utils
+
+
+def get_group_queries(context):
+    # The profiler explains the queries of a request
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("SELECT") and '"auth_group"' in query["sql"]
+    ]
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "roles-test",
+        },
+        "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+)
+class RolesTest(TestCase):
+    def setUp(self):
+        roles._load_roles_of_version.cache_clear()
+        self.user1 = core_factories.UserFactory()
+        self.author_group = Group.objects.create(name="author")
+        self.moderator_group = Group.objects.create(name="moderator")
+        self.user1.groups.add(self.author_group)
+        return super().setUp()
+
+    # A fresh instance, as loaded by a request
+    def get_user(self):
+        return get_user_model().objects.get(pk=self.user1.pk)
+
+    def test_memoized(self):
+        self.assertEqual(roles.get_roles(self.get_user()), {"author"})
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(roles.get_roles(self.get_user()), {"author"})
+
+        self.assertEqual(get_group_queries(context), [])
+
+    def test_membership_changed(self):
+        roles.get_roles(self.get_user())
+        self.user1.groups.add(self.moderator_group)
+        self.assertEqual(roles.get_roles(self.get_user()), {"author", "moderator"})
+
+        self.moderator_group.user_set.remove(self.user1)
+        self.assertEqual(roles.get_roles(self.get_user()), {"author"})
+
+    def test_group_renamed(self):
+        roles.get_roles(self.get_user())
+        self.author_group.name = "writer"
+        self.author_group.save()
+        self.assertEqual(roles.get_roles(self.get_user()), {"writer"})
+
+    def test_anonymous(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(roles.get_roles(AnonymousUser()), frozenset())
+
+        self.assertEqual(context.captured_queries, [])
+
+
+class RolesPerRequestTest(APITestCase):
+    def setUp(self):
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.user2.groups.add(
+            Group.objects.create(name="author"), Group.objects.create(name="moderator")
+        )
+        post = posts_factories.PostFactory(
+            owner=self.user1, thumbnail="https://fake-url.com/media/thumbnail.webp"
+        )
+        self.comment = posts_factories.CommentFactory(owner=self.user1, post=post)
+        return super().setUp()
+
+    def test_composed_permissions_load_roles_once(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+        url = reverse("comment-detail", kwargs={"pk": self.comment.pk})
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.delete(url)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(get_group_queries(context)), 1)
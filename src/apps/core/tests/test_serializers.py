@@ -0,0 +1,99 @@
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers as serials
+
+from ...profiles.serializers import ProfileSerializer
+from .. import model_factories as core_factories
+from ..serializers import base as base_serials
+from ..serializers.auth import UserSerializer
+
+
+class BatchedManyRelatedFieldTest(TestCase):
+    def setUp(self):
+        self.groups = [
+            Group.objects.create(name=name)
+            for name in ("author", "commenter", "moderator")
+        ]
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.user3 = core_factories.UserFactory()
+        return super().setUp()
+
+    def get_queries(self, context):
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+
+    def test_slugs_resolved_in_one_query(self):
+        serializer = UserSerializer(
+            self.user1,
+            data={"groups": ["moderator", "author", "commenter", "author"]},
+            partial=True,
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(serializer.is_valid())
+
+        self.assertEqual(len(self.get_queries(context)), 1)
+        self.assertEqual(
+            serializer.validated_data["groups"],
+            [self.groups[2], self.groups[0], self.groups[1], self.groups[0]],
+        )
+
+    def test_slugs_per_item_errors(self):
+        serializer = UserSerializer(
+            self.user1,
+            data={"groups": ["author", "reader", "commenter", "writer"]},
+            partial=True,
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors["groups"]), {1, 3})
+        self.assertEqual(
+            serializer.errors["groups"][1],
+            ["Object with name=reader does not exist."],
+        )
+
+    def test_primary_keys_resolved_in_one_query(self):
+        class GroupsField(
+            base_serials.BatchedRelatedFieldMixin, serials.PrimaryKeyRelatedField
+        ):
+            pass
+
+        field = GroupsField(many=True, queryset=Group.objects.all())
+
+        with CaptureQueriesContext(connection) as context:
+            groups = field.run_validation([self.groups[1].pk, self.groups[0].pk])
+
+        self.assertEqual(len(self.get_queries(context)), 1)
+        self.assertEqual(groups, [self.groups[1], self.groups[0]])
+
+    def test_hyperlinks_resolved_in_one_query(self):
+        serializer = ProfileSerializer(
+            self.user1.profile,
+            data={"followers": [self.user3.pk, self.user2.pk]},
+            partial=True,
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(serializer.is_valid())
+
+        self.assertEqual(len(self.get_queries(context)), 1)
+        self.assertEqual(
+            serializer.validated_data["followers"], [self.user3, self.user2]
+        )
+
+    def test_hyperlinks_per_item_errors(self):
+        missing_pk = self.user3.pk + 1
+        serializer = ProfileSerializer(
+            self.user1.profile,
+            data={"followers": [self.user2.pk, "wahoo", missing_pk]},
+            partial=True,
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors["followers"]), {1, 2})
@@ -0,0 +1,166 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...posts import model_factories as posts_factories
+from ...posts import models as posts_models
+from .. import model_factories as core_factories
+from .. import throttling as core_throttling
+from . import utils as test_utils
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "throttling-test",
+        },
+        "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+)
+class TokenBucketThrottleTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.dict(
+            core_throttling.TokenBucketThrottle.THROTTLE_RATES,
+            {
+                "user_writes": "2/min",
+                "ip_writes": "3/min",
+                "user_batches": "1/min",
+                "ip_batches": "2/min",
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(
+            core_throttling.TokenBucketThrottle, "timer", return_value=1000.0
+        )
+        self.mock_timer = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Buckets are kept across tests otherwise
+        caches["shared"].clear()
+
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.user3 = core_factories.UserFactory()
+        self.post = posts_factories.PostFactory(
+            owner=self.user1,
+            title="A post title that is long enough",
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.url = reverse("post-reaction", kwargs={"pk": self.post.pk})
+        return super().setUp()
+
+    def put_reaction(self, username, **extra):
+        test_utils.jwt_login(self.client, username)
+        return self.client.put(self.url, {"type": "L"}, **extra)
+
+    def test_user_bucket(self):
+        for remaining in (1, 0):
+            res = self.put_reaction(self.user2.username)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res["X-RateLimit-Limit"], "2")
+            self.assertEqual(res["X-RateLimit-Remaining"], str(remaining))
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.put_reaction(self.user2.username)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res["X-RateLimit-Remaining"], "0")
+        self.assertEqual(res["X-RateLimit-Reset"], "60")
+        self.assertEqual(res["Retry-After"], "30")
+
+    def test_user_bucket_refills(self):
+        for _ in range(2):
+            self.put_reaction(self.user2.username)
+
+        # A token is added every 30 seconds
+        self.mock_timer.return_value += 30
+        res = self.put_reaction(self.user2.username)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-RateLimit-Remaining"], "0")
+
+    def test_ip_bucket(self):
+        for _ in range(2):
+            res = self.put_reaction(self.user2.username)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.put_reaction(self.user3.username)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-RateLimit-Limit"], "3")
+        self.assertEqual(res["X-RateLimit-Remaining"], "0")
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.put_reaction(self.user3.username)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_ip_bucket_ignores_forwarded_for(self):
+        for i in range(3):
+            res = self.put_reaction(
+                (self.user2, self.user3)[i % 2].username,
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{i}",
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.put_reaction(
+                self.user3.username, HTTP_X_FORWARDED_FOR="10.0.0.9"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_rejected_request_takes_no_tokens(self):
+        for _ in range(2):
+            self.put_reaction(self.user2.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.put_reaction(self.user2.username)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # The IP bucket still holds the token of the rejected request
+        res = self.put_reaction(self.user3.username)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-RateLimit-Remaining"], "0")
+
+    def test_batch_bucket(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+        url = reverse("reaction-batch")
+        data = [{"type": "L", "post": self.post.pk}]
+
+        res = self.client.post(url, data, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-RateLimit-Limit"], "1")
+        self.assertEqual(res["X-RateLimit-Remaining"], "0")
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(url, data, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # The write buckets still hold a token for a single reaction
+        res = self.put_reaction(self.user2.username)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_reads_not_throttled(self):
+        for _ in range(3):
+            res = self.client.get(reverse("post-detail", kwargs={"pk": self.post.pk}))
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("X-RateLimit-Remaining", res)
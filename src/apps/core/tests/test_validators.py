@@ -0,0 +1,119 @@
+from unittest import mock
+
+import requests
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .. import model_factories as core_factories
+from .. import validators as core_validators
+from . import utils as test_utils
+
+shared_locmem_caches = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "image-url-test",
+    },
+    "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+
+def image_response(content_type="image/webp"):
+    res = mock.Mock()
+    res.headers = {"content-type": content_type}
+    return res
+
+
+@override_settings(CACHES=shared_locmem_caches)
+class CheckImageUrlTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch("apps.core.validators.requests.head")
+        self.mock_head = patcher.start()
+        self.mock_head.return_value = image_response()
+        self.addCleanup(patcher.stop)
+
+        core_validators.caches["shared"].clear()
+        return super().setUp()
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            core_validators.normalize_url("HTTPS://Example.COM:443/a/B.png#top"),
+            "https://example.com/a/B.png",
+        )
+        self.assertEqual(
+            core_validators.normalize_url("http://example.com:8080/b.png?s=1"),
+            "http://example.com:8080/b.png?s=1",
+        )
+
+    def test_result_cached(self):
+        for url in ["https://example.com/a.png", "https://EXAMPLE.com:443/a.png"]:
+            self.assertEqual(core_validators.check_image_url(url), "")
+
+        self.assertEqual(self.mock_head.call_count, 1)
+
+    def test_error_cached(self):
+        self.mock_head.return_value = image_response("text/html")
+
+        for _ in range(2):
+            self.assertEqual(
+                core_validators.check_image_url("https://example.com/a.png"),
+                "URL does not point to an image.",
+            )
+
+        self.assertEqual(self.mock_head.call_count, 1)
+
+    @override_settings(IMAGE_URL_NEGATIVE_CACHE_TIMEOUT=0)
+    def test_error_ttl(self):
+        self.mock_head.side_effect = requests.ConnectionError
+
+        for _ in range(2):
+            self.assertEqual(
+                core_validators.check_image_url("https://example.com/a.png"),
+                "Unable to reach the URL.",
+            )
+
+        self.assertEqual(self.mock_head.call_count, 2)
+
+    def test_validate_not_requested(self):
+        core_validators.validate_image_url("https://example.com/a.png")
+
+        with self.assertRaises(ValidationError):
+            core_validators.validate_image_url("https://example.com/a.txt")
+
+        self.mock_head.assert_not_called()
+
+
+class ChangedOnlyValidationTest(APITestCase):
+    def setUp(self):
+        self.user1 = core_factories.UserFactory()
+        self.profile = self.user1.profile
+        # Stored before the extension was validated
+        self.profile.pic = "https://example.com/pic.txt"
+        self.profile.save(update_fields=["pic"])
+        self.url = reverse("profile-detail", kwargs={"pk": self.profile.pk})
+        return super().setUp()
+
+    def test_model_unchanged(self):
+        self.profile.bio = "Unrelated edit"
+        self.profile.full_clean()
+
+        self.profile.pic = "https://example.com/other.txt"
+
+        with self.assertRaises(ValidationError):
+            self.profile.full_clean()
+
+    def test_serializer_unchanged(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        res = self.client.patch(
+            self.url, {"pic": self.profile.pic, "bio": "Unrelated edit"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.patch(self.url, {"pic": "https://example.com/other.txt"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import Group
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ....core import model_factories as core_factories
+from ....core.tests import utils as test_utils
+
+
+class DatabasePoolStatsTest(APITestCase):
+    def setUp(self):
+        self.user1 = core_factories.UserFactory()
+        self.url = reverse("db-pool-stats")
+        return super().setUp()
+
+    def test_get_not_admin(self):
+        moderator_group = Group.objects.create(name="moderator")
+        self.user1.groups.add(moderator_group)
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_admin(self):
+        self.user1.is_staff = True
+        self.user1.save()
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # The test databases are not pooled
+        self.assertEqual(res.data, {alias: None for alias in connections})
@@ -0,0 +1,94 @@
+"""
+Throttling of writes with token buckets.
+A bucket holds up to the number of requests of its rate and refills evenly
+over the duration of the rate, so bursts are allowed up to that number while
+the sustained rate is capped. A bucket is stored as its token count and the
+time it was last updated, in place of the request history of DRF's throttles,
+in the cache shared by the worker processes of a host. Concurrent requests may
+race on a bucket, which at worst lets a request through. A request only takes
+tokens once all of its throttles allow it, so a rejected request costs none.
+"""
+
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import permissions, throttling
+
+
+class TokenBucketThrottle(throttling.SimpleRateThrottle):
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        self.tokens = None
+
+        if self.rate is None or request.method in permissions.SAFE_METHODS:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, self.now))
+        refilled = (self.now - updated) * self.num_requests / self.duration
+        self.tokens = min(self.num_requests, tokens + refilled)
+        return self.tokens >= 1
+
+    # Take a token for the request, once every throttle of the request allowed
+    # it, see core.mixins.TokenBucketThrottleMixin
+    def consume(self):
+        if self.tokens is None:
+            return
+
+        self.tokens -= 1
+        # An idle bucket is full again within the duration
+        self.cache.set(self.key, (self.tokens, self.now), self.duration)
+
+    # Seconds until the bucket holds a token
+    def wait(self):
+        return max(0, (1 - self.tokens) * self.duration / self.num_requests)
+
+    def get_remaining(self):
+        return math.floor(self.tokens)
+
+    # Seconds until the bucket is full
+    def get_reset(self):
+        return math.ceil(
+            (self.num_requests - self.tokens) * self.duration / self.num_requests
+        )
+
+
+class UserWriteThrottle(TokenBucketThrottle):
+    scope = "user_writes"
+
+    def get_cache_key(self, request, view):
+        if not request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
+
+
+# Also limits clients that write as many users. Clients are identified by
+# the address of the connection unless NUM_PROXIES trusted proxies set
+# X-Forwarded-For.
+class IPWriteThrottle(TokenBucketThrottle):
+    scope = "ip_writes"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+# Requests that write many rows at once, also limited by the write throttles
+class UserBatchThrottle(UserWriteThrottle):
+    scope = "user_batches"
+
+
+class IPBatchThrottle(IPWriteThrottle):
+    scope = "ip_batches"
@@ -1,24 +1,74 @@
+import hashlib
 import os
-from urllib.parse import urlparse
+from urllib.parse import urlsplit, urlunsplit
 
 import requests
+from django.conf import settings
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 
+default_ports = {"http": 80, "https": 443}
 
+
+# Equivalent URLs share a validation result
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        # Rejected by the URL validator
+        return url
+
+    if port is not None and port != default_ports.get(scheme):
+        netloc = f"{netloc}:{port}"
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+# Only the URL itself is checked, reachability is verified in the background,
+# see core.images
 def validate_image_url(url):
     image_exts = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-    path = urlparse(url).path
+    path = urlsplit(url).path
     ext = os.path.splitext(path)[1].lower()
 
     if ext not in image_exts:
         raise ValidationError("URL does not have a valid image file extension.")
 
+
+# Request the URL and return an error message, empty if it is an image.
+# The result is cached, shared by the worker processes of a host.
+def check_image_url(url):
+    cache = caches["shared"]
+    digest = hashlib.md5(normalize_url(url).encode(), usedforsecurity=False)
+    key = f"image-url:{digest.hexdigest()}"
+    message = cache.get(key)
+
+    if message is None:
+        message = _request_image_url(url)
+
+        if message:
+            timeout = settings.IMAGE_URL_NEGATIVE_CACHE_TIMEOUT
+        else:
+            timeout = settings.IMAGE_URL_CACHE_TIMEOUT
+
+        cache.set(key, message, timeout)
+
+    return message
+
+
+def _request_image_url(url):
     try:
         res = requests.head(url, allow_redirects=True, timeout=5)
     except requests.RequestException:
-        raise ValidationError("Unable to reach the URL.")
+        return "Unable to reach the URL."
 
-    content_type = res.headers["content-type"]
+    content_type = res.headers.get("content-type", "")
 
     if not content_type.startswith("image/"):
-        raise ValidationError("URL does not point to an image.")
+        return "URL does not point to an image."
+
+    return ""
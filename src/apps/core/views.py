@@ -1,17 +1,29 @@
 from django.contrib.auth.models import Group
+from django.db import connections
 from djoser import views
 from djoser.conf import settings
 from rest_framework import permissions, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from . import mixins as core_mixins
 from . import permissions as core_perms
 from .serializers.auth import GroupSerializer, UserSerializer
 
 
 # This viewset is needed to allow moderators to manage author and commenter groups
-class UserViewSet(views.UserViewSet):
+class UserViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.IdentityMapMixin,
+    views.UserViewSet,
+):
+    # Every user can look up themselves, so their lookup needs no query
     def initial(self, request, *args, **kwargs):
-        self.user_groups = list(request.user.groups.values_list("name", flat=True))
-        return super().initial(request, *args, **kwargs)
+        super().initial(request, *args, **kwargs)
+
+        if request.user.is_authenticated:
+            core_mixins.remember_object(request, request.user)
 
     def get_permissions(self):
         if self.action == "create":
@@ -74,7 +86,27 @@ class UserViewSet(views.UserViewSet):
         return super().get_serializer(*args, **kwargs)
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.IdentityMapMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Group.objects.all().order_by("name")
     serializer_class = GroupSerializer
     permission_classes = [permissions.IsAdminUser]
+
+
+# Utilization of the database connection pools of this worker process, null
+# for databases without one
+class DatabasePoolStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        stats = {}
+
+        for connection in connections.all():
+            pool = getattr(connection, "pool", None)
+            stats[connection.alias] = pool.get_stats() if pool is not None else None
+
+        return Response(stats)
@@ -1,17 +1,75 @@
 import django_filters
+from django import forms
 from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils.translation import gettext_lazy as _
 
+from ..core import filters as core_filters
 from . import models as posts_models
+from . import search as posts_search
 
 User = get_user_model()
 
 
+class TagTitlesField(forms.Field):
+    """
+    A list of tag titles, as repeated or comma-separated values, cleaned to
+    the ids of the tags with a single query.
+    """
+
+    widget = django_filters.widgets.QueryArrayWidget
+    default_error_messages = {
+        "invalid_choice": _(
+            "Select a valid choice. %(value)s is not one of the available choices."
+        ),
+    }
+
+    def clean(self, value):
+        titles = {
+            title.strip()
+            for values in value or []
+            for title in values.split(",")
+            if title.strip()
+        }
+
+        if not titles:
+            return []
+
+        tag_ids = dict(
+            posts_models.Tag.objects.filter(title__in=titles).values_list("title", "pk")
+        )
+
+        for title in sorted(titles):
+            if title not in tag_ids:
+                raise forms.ValidationError(
+                    self.error_messages["invalid_choice"],
+                    code="invalid_choice",
+                    params={"value": title},
+                )
+
+        return list(tag_ids.values())
+
+
+class TagTitlesFilter(django_filters.Filter):
+    field_class = TagTitlesField
+
+
 class TagFilter(django_filters.FilterSet):
     class Meta:
         model = posts_models.Tag
         fields = []
 
     title = django_filters.CharFilter(lookup_expr="icontains")
+    # Titles are unique, so they break ties in the ordering
+    ordering = django_filters.OrderingFilter(
+        fields=["title", "post_count", "published_post_count"],
+        method="filter_ordering",
+    )
+
+    def filter_ordering(self, queryset, name, value):
+        ordering_filter = self.filters[name]
+        ordering = [ordering_filter.get_ordering_value(param) for param in value]
+        return queryset.order_by(*ordering, "title")
 
 
 class PostFilter(django_filters.FilterSet):
@@ -23,19 +81,44 @@ class PostFilter(django_filters.FilterSet):
         }
 
     title = django_filters.CharFilter(lookup_expr="icontains")
-    owner = django_filters.CharFilter(
-        field_name="owner__username", lookup_expr="icontains"
-    )
+    owner = core_filters.UsernameFilter(field_name="owner")
     private = django_filters.BooleanFilter(
         field_name="publish_date", lookup_expr="isnull"
     )
     content = django_filters.CharFilter(lookup_expr="icontains")
-    tag = django_filters.ModelMultipleChoiceFilter(
-        field_name="tags__title",
-        to_field_name="title",
-        queryset=posts_models.Tag.objects.all(),
+    search = django_filters.CharFilter(method="filter_search")
+    tag = TagTitlesFilter(method="filter_tag")
+    tag_mode = django_filters.ChoiceFilter(
+        choices=[("any", "any"), ("all", "all")], method="filter_tag_mode"
     )
 
+    # Full-text search ordered by relevance, then the default ordering
+    def filter_search(self, queryset, name, value):
+        return posts_search.search_posts(queryset, value).order_by(
+            "-search_rank", *queryset.query.order_by
+        )
+
+    # Posts with any or all of the tags, as semi-joins on the through table
+    # rather than a join that multiplies rows.
+    def filter_tag(self, queryset, name, value):
+        if not value:
+            return queryset
+
+        post_tags = posts_models.Post.tags.through.objects.filter(
+            post=models.OuterRef("pk")
+        )
+
+        if self.form.cleaned_data.get("tag_mode") == "all":
+            return queryset.filter(
+                *[models.Exists(post_tags.filter(tag=tag_id)) for tag_id in value]
+            )
+
+        return queryset.filter(models.Exists(post_tags.filter(tag__in=value)))
+
+    # Applied by filter_tag
+    def filter_tag_mode(self, queryset, name, value):
+        return queryset
+
 
 class CommentFilter(django_filters.FilterSet):
     class Meta:
@@ -46,9 +129,7 @@ class CommentFilter(django_filters.FilterSet):
             "reply_to": ["exact"],
         }
 
-    owner = django_filters.CharFilter(
-        field_name="owner__username", lookup_expr="icontains"
-    )
+    owner = core_filters.UsernameFilter(field_name="owner")
     content = django_filters.CharFilter(lookup_expr="icontains")
 
 
@@ -62,6 +143,4 @@ class ReactionFilter(django_filters.FilterSet):
             "comment": ["exact"],
         }
 
-    owner = django_filters.CharFilter(
-        field_name="owner__username", lookup_expr="icontains"
-    )
+    owner = core_filters.UsernameFilter(field_name="owner")
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:42
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_reactions(apps, schema_editor):
+    Reaction = apps.get_model("posts", "Reaction")
+
+    for model_name, target_field in (("Post", "post"), ("Comment", "comment")):
+        model = apps.get_model("posts", model_name)
+        counts = {}
+
+        for reaction_type, count_field in (("L", "like_count"), ("D", "dislike_count")):
+            count = (
+                Reaction.objects.filter(
+                    **{target_field: models.OuterRef("pk")}, type=reaction_type
+                )
+                .values(target_field)
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            )
+            counts[count_field] = Coalesce(models.Subquery(count), 0)
+
+        model.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0015_alter_comment_reply_to"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="dislike_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="dislike_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_reactions, migrations.RunPython.noop),
+    ]
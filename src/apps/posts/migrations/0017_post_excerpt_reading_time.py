@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:48
+
+import math
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+# Mirrors Post.save
+def summarize_posts(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    posts = []
+
+    for post in Post.objects.only("pk", "content").iterator():
+        words = post.content.split()
+        post.excerpt = Truncator(" ".join(words)).chars(280)
+        post.reading_time = math.ceil(len(words) / 200)
+        posts.append(post)
+
+    Post.objects.bulk_update(posts, ["excerpt", "reading_time"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0016_post_comment_reaction_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=280),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(summarize_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Comment = apps.get_model("posts", "Comment")
+    Post = apps.get_model("posts", "Post")
+    count = (
+        Comment.objects.filter(post=models.OuterRef("pk"))
+        .values("post")
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    Post.objects.update(comment_count=Coalesce(models.Subquery(count), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0017_post_excerpt_reading_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:12
+
+from django.db import migrations
+
+from apps.posts import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_index(schema_editor)
+    search.rebuild_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0019_row_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
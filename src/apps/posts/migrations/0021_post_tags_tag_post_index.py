@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:31
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0020_post_search"),
+    ]
+
+    # The through table is auto-created, so its index is created in SQL.
+    # Tag filters seek on the tag and read the post from the index alone.
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX posts_post_tags_tag_id_post_id "
+            "ON posts_post_tags (tag_id, post_id)",
+            "DROP INDEX posts_post_tags_tag_id_post_id",
+        ),
+    ]
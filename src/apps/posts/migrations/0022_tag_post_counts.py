@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:17
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_posts(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    Tag = apps.get_model("posts", "Tag")
+    post_tags = Post.tags.through.objects.filter(tag=models.OuterRef("pk"))
+
+    def count(post_tags):
+        return Coalesce(
+            models.Subquery(
+                post_tags.values("tag")
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Tag.objects.update(
+        post_count=count(post_tags),
+        published_post_count=count(post_tags.filter(post__publish_date__isnull=False)),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0021_post_tags_tag_post_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="published_post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["-post_count", "title"], name="posts_tag_post_co_1e97c9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["-published_post_count", "title"],
+                name="posts_tag_publish_643490_idx",
+            ),
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+# URLs saved before are verified in the background like new ones
+def verify_blank_thumbnails(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    Post.objects.filter(thumbnail="").update(thumbnail_status="verified")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0022_tag_post_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("verified", "Verified"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=8,
+            ),
+        ),
+        migrations.RunPython(verify_blank_thumbnails, migrations.RunPython.noop),
+    ]
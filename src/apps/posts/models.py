@@ -1,19 +1,60 @@
+import datetime
+import math
+
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator, RegexValidator
-from django.db import models
+from django.db import connection, models, transaction
 from django.db.models.functions import Lower
+from django.utils.text import Truncator
 
+from ..core import caching
+from ..core.models import (
+    CleanOnSaveModel,
+    ImageStatus,
+    VerifiedImagesModel,
+    VersionedModel,
+)
 from ..core.validators import validate_image_url
+from . import search
+
+
+class CountedModel(models.Model):
+    """
+    A model with counts maintained in SQL by writes of other models, so they
+    are never written by a full save (the in-memory values may be stale).
+    """
+
+    class Meta:
+        abstract = True
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            excluded_fields = {*self.counter_fields, *self.get_deferred_fields()}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in excluded_fields
+                and field.attname not in excluded_fields
+            ]
+
+        super().save(*args, **kwargs)
 
 
-class Tag(models.Model):
+class Tag(CountedModel):
     class Meta:
         constraints = [
             models.CheckConstraint(
                 condition=models.Q(title=Lower("title")), name="lowercase_title"
             )
         ]
+        indexes = [
+            models.Index(fields=["-post_count", "title"]),
+            models.Index(fields=["-published_post_count", "title"]),
+        ]
 
     title = models.CharField(
         max_length=20,
@@ -28,13 +69,66 @@ class Tag(models.Model):
         ],
     )
 
+    counter_fields = ("post_count", "published_post_count")
+
+    # Maintained by changes to the tags of posts, see the posts signals
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    published_post_count = models.PositiveIntegerField(default=0, editable=False)
+
     def __str__(self):
         return self.title
 
+    # Tag ids may be a subquery
+    @staticmethod
+    def update_post_counts(tag_ids, step=0, published_step=0):
+        counts = {}
+
+        if step:
+            counts["post_count"] = models.F("post_count") + step
+
+        if published_step:
+            counts["published_post_count"] = (
+                models.F("published_post_count") + published_step
+            )
+
+        if counts:
+            Tag.objects.filter(pk__in=tag_ids).update(**counts)
+
+
+class ReactionTarget(CountedModel):
+    """
+    A model that reactions can target.
+    The reaction counts are maintained by Reaction writes.
+    """
+
+    class Meta:
+        abstract = True
+
+    counter_fields = ("like_count", "dislike_count")
+
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    dislike_count = models.PositiveIntegerField(default=0, editable=False)
+
+
+class Post(ReactionTarget, VersionedModel, VerifiedImagesModel):
+    counter_fields = (*ReactionTarget.counter_fields, "comment_count")
+    tracked_fields = ("publish_date", "thumbnail")
+    validate_changed_only = ("thumbnail",)
+    verified_image_fields = {"thumbnail": "thumbnail_status"}
+    excerpt_length = 280
+    words_per_minute = 200
+    # The min tag count only applies to published posts
+    min_tag_count = 1
+    max_tag_count = 5
 
-class Post(models.Model):
     title = models.CharField(max_length=100, validators=[MinLengthValidator(20)])
     thumbnail = models.URLField(blank=True, validators=[validate_image_url])
+    thumbnail_status = models.CharField(
+        max_length=8,
+        choices=ImageStatus,
+        default=ImageStatus.PENDING,
+        editable=False,
+    )
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -47,6 +141,11 @@ class Post(models.Model):
         max_length=18500, blank=True, validators=[MinLengthValidator(1850)]
     )
     tags = models.ManyToManyField(Tag, related_name="+")
+    # Derived from content on save for summary responses
+    excerpt = models.CharField(max_length=excerpt_length, blank=True, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Maintained by Comment writes
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     def clean(self):
         super().clean()
@@ -55,15 +154,131 @@ class Post(models.Model):
             if not self.thumbnail:
                 raise ValidationError("A published post must have a thumbnail.")
 
+            if (
+                settings.PUBLISH_REQUIRES_VERIFIED_THUMBNAIL
+                and self.get_image_status("thumbnail") != ImageStatus.VERIFIED
+                and (self._state.adding or not self.get_loaded_value("publish_date"))
+            ):
+                raise ValidationError(
+                    "A post can only be published once its thumbnail is verified."
+                )
+
             if not self.content:
                 raise ValidationError("A published post must have content.")
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        super().save(*args, **kwargs)
 
+        # Reading time is in minutes, rounded up
+        words = self.content.split()
+        self.excerpt = Truncator(" ".join(words)).chars(self.excerpt_length)
+        self.reading_time = math.ceil(len(words) / self.words_per_minute)
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt", "reading_time"}
+
+        reindex = update_fields is None or bool({"title", "content"} & {*update_fields})
+        published_step = 0
+
+        if not self._state.adding and (
+            update_fields is None or "publish_date" in update_fields
+        ):
+            was_published = self.get_loaded_value("publish_date") is not None
+            published_step = int(self.publish_date is not None) - int(was_published)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if reindex:
+                search.index_post(self)
+
+            # Publishing changes the published post count of the tags
+            if published_step:
+                Tag.update_post_counts(
+                    Post.tags.through.objects.filter(post=self).values("tag"),
+                    published_step=published_step,
+                )
+
+    def check_tag_count(self, tag_count):
+        if tag_count > self.max_tag_count:
+            raise ValidationError(
+                f"A post must have at most {self.max_tag_count} tag(s)."
+            )
+
+        if self.publish_date is not None and tag_count < self.min_tag_count:
+            raise ValidationError(
+                f"A published post must have at least {self.min_tag_count} tag(s)."
+            )
+
+    def set_tags(self, tags):
+        """
+        Set the tags of the post to the given tags, or to those with the given
+        titles. The new set is diffed against the current one in memory, so a
+        change is at most one insert and one delete of tag rows, without the
+        M2M signals.
+        """
+        tags = list(tags)
+
+        if all(isinstance(tag, Tag) for tag in tags):
+            tag_ids = {tag.title: tag.pk for tag in tags}
+            self.check_tag_count(len(tag_ids))
+        else:
+            titles = set(tags)
+            self.check_tag_count(len(titles))
+            tag_ids = dict(
+                Tag.objects.filter(title__in=titles).values_list("title", "pk")
+            )
+            unknown_titles = titles - tag_ids.keys()
+
+            if unknown_titles:
+                raise ValidationError(
+                    [
+                        f"Tag with title={title} does not exist."
+                        for title in sorted(unknown_titles)
+                    ]
+                )
+
+        through = Post.tags.through
+        published_step = 1 if self.publish_date is not None else 0
+
+        with transaction.atomic():
+            current_tag_ids = set(
+                through.objects.filter(post=self).values_list("tag_id", flat=True)
+            )
+            added_tag_ids = set(tag_ids.values()) - current_tag_ids
+            removed_tag_ids = current_tag_ids - set(tag_ids.values())
+
+            if not added_tag_ids and not removed_tag_ids:
+                return
+
+            if removed_tag_ids:
+                through.objects.filter(post=self, tag_id__in=removed_tag_ids).delete()
+                Tag.update_post_counts(
+                    removed_tag_ids, step=-1, published_step=-published_step
+                )
+
+            if added_tag_ids:
+                through.objects.bulk_create(
+                    [through(post=self, tag_id=tag_id) for tag_id in added_tag_ids]
+                )
+                Tag.update_post_counts(
+                    added_tag_ids, step=1, published_step=published_step
+                )
+
+            # The tag titles are part of the post representation
+            Post.objects.filter(pk=self.pk).update(version=models.F("version") + 1)
+            caching.invalidate("posts", "tags")
+
+        getattr(self, "_prefetched_objects_cache", {}).pop("tags", None)
+
+
+class Comment(ReactionTarget, VersionedModel, CleanOnSaveModel):
+    # The relations are immutable, so they are validated on creation only
+    tracked_fields = ("post", "reply_to")
+    validate_changed_only = ("post", "reply_to")
+    clean_related_fields = {"post": ("publish_date",), "reply_to": ("reply_to",)}
 
-class Comment(models.Model):
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -84,22 +299,93 @@ class Comment(models.Model):
     def clean(self):
         super().clean()
 
-        if not self.post.publish_date:
-            raise ValidationError("A comment cannot be made on a private post.")
+        if self.is_cleaned("post"):
+            post = self.get_related("post")
 
-        if self.reply_to:
-            if self.reply_to == self:
+            if post is not None and not post.publish_date:
+                raise ValidationError("A comment cannot be made on a private post.")
+
+        if self.is_cleaned("reply_to") and self.reply_to_id is not None:
+            if self.reply_to_id == self.pk:
                 raise ValidationError("A comment cannot be a reply to itself.")
 
-            if self.reply_to.reply_to:
+            reply_to = self.get_related("reply_to")
+
+            if reply_to is not None and reply_to.reply_to_id is not None:
                 raise ValidationError("A comment cannot be a reply to a reply.")
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        self.clean_on_save(kwargs.get("update_fields"))
+
+        with transaction.atomic():
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+
+            # The post of a comment is immutable, so only creation counts
+            if adding:
+                Post.objects.filter(pk=self.post_id).update(
+                    comment_count=models.F("comment_count") + 1,
+                    version=models.F("version") + 1,
+                )
+
+    @classmethod
+    def bulk_delete(cls, queryset, batch_size=500):
+        """
+        Delete the comments of a queryset in batches of set based deletes,
+        without loading them. Replies are deleted with the comments they
+        reply to, and reactions with the comments they target, as the CASCADE
+        of reply_to and Reaction.comment would. The comment counts of the
+        posts are updated.
+        Return the counts of deleted comments and reactions.
+        """
+        counts = {"comments": 0, "reactions": 0}
 
+        while True:
+            with transaction.atomic():
+                ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+
+                if not ids:
+                    break
+
+                deleted = cls.objects.filter(
+                    models.Q(pk__in=ids) | models.Q(reply_to__in=ids)
+                )
+                post_counts = dict(
+                    deleted.order_by()
+                    .values("post")
+                    .annotate(count=models.Count("pk"))
+                    .values_list("post", "count")
+                )
+                counts["reactions"] += Reaction.objects.filter(
+                    comment__in=deleted
+                )._raw_delete(deleted.db)
+                counts["comments"] += deleted._raw_delete(deleted.db)
+                Post.objects.filter(pk__in=post_counts).update(
+                    comment_count=models.F("comment_count")
+                    - models.Case(
+                        *(
+                            models.When(pk=post_id, then=models.Value(count))
+                            for post_id, count in post_counts.items()
+                        ),
+                        default=models.Value(0),
+                    ),
+                    version=models.F("version") + 1,
+                )
+
+        # The deletes bypass the Comment signals, see posts.signals
+        if counts["comments"]:
+            caching.invalidate("comments", "posts")
+
+        return counts
+
+
+class Reaction(CleanOnSaveModel):
+    # The comment and its post are loaded in one query
+    clean_related_fields = {
+        "post": ("publish_date",),
+        "comment": ("post__publish_date",),
+    }
 
-class Reaction(models.Model):
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -146,17 +432,336 @@ class Reaction(models.Model):
         related_name="reactions",
     )
 
+    @staticmethod
+    def get_count_field(reaction_type):
+        if reaction_type == Reaction.ReactionType.LIKE:
+            return "like_count"
+
+        return "dislike_count"
+
+    @staticmethod
+    def get_target_queryset(post_id=None, comment_id=None):
+        if post_id is not None:
+            return Post.objects.filter(pk=post_id)
+
+        return Comment.objects.filter(pk=comment_id)
+
+    @staticmethod
+    def update_target_counts(reaction_type, post_id=None, comment_id=None, step=1):
+        """
+        Add step to the like/dislike count of the reaction target.
+        The update is done in SQL so that concurrent reactions are not lost.
+        """
+        count_field = Reaction.get_count_field(reaction_type)
+        Reaction.get_target_queryset(post_id, comment_id).update(
+            **{count_field: models.F(count_field) + step},
+            version=models.F("version") + 1,
+        )
+
+    @staticmethod
+    def update_target_counts_on_change(
+        previous_type, new_type, post_id=None, comment_id=None
+    ):
+        """
+        Move a reaction of the target from one type to another in one update.
+        A type of None means no reaction.
+        """
+        if previous_type == new_type:
+            return
+
+        counts = {}
+
+        for reaction_type, step in ((previous_type, -1), (new_type, 1)):
+            if reaction_type is not None:
+                count_field = Reaction.get_count_field(reaction_type)
+                counts[count_field] = models.F(count_field) + step
+
+        Reaction.get_target_queryset(post_id, comment_id).update(
+            **counts, version=models.F("version") + 1
+        )
+
+    @classmethod
+    def upsert(cls, owner_id, reaction_type, post_id=None, comment_id=None):
+        """
+        Set the reaction of an owner to a target in a single statement, so
+        that concurrent requests of the owner cannot conflict, and update the
+        counts of the target. The target is not validated.
+        Return the previous reaction type, None if there was no reaction.
+        """
+        target_column = "post_id" if post_id is not None else "comment_id"
+        other_type = (
+            cls.ReactionType.DISLIKE
+            if reaction_type == cls.ReactionType.LIKE
+            else cls.ReactionType.LIKE
+        )
+        # The conflict target is that of a partial unique constraint, and a
+        # row of the same type is not updated
+        sql = (
+            f"INSERT INTO {cls._meta.db_table} "
+            "(owner_id, post_id, comment_id, type, create_date) "
+            "VALUES (%s, %s, %s, %s, %s) "
+            f"ON CONFLICT (owner_id, {target_column}) "
+            f"WHERE {target_column} IS NOT NULL "
+            "DO UPDATE SET type = excluded.type "
+            f"WHERE {cls._meta.db_table}.type <> excluded.type"
+        )
+        params = [owner_id, post_id, comment_id, reaction_type, datetime.date.today()]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Only inserted rows have no deleting transaction
+                cursor.execute(f"{sql} RETURNING xmax = 0", params)
+                row = cursor.fetchone()
+
+                if row is None:
+                    previous_type = reaction_type
+                elif row[0]:
+                    previous_type = None
+                else:
+                    previous_type = other_type
+            else:
+                # SQLite has a single writer, so a concurrent change of the
+                # row fails the upsert rather than falsifying this read
+                previous_type = (
+                    cls.objects.filter(
+                        owner_id=owner_id, **{target_column: post_id or comment_id}
+                    )
+                    .values_list("type", flat=True)
+                    .first()
+                )
+                cursor.execute(sql, params)
+
+            cls.update_target_counts_on_change(
+                previous_type, reaction_type, post_id, comment_id
+            )
+
+        return previous_type
+
+    @classmethod
+    def remove(cls, owner_id, post_id=None, comment_id=None):
+        """
+        Delete the reaction of an owner to a target in a single statement, and
+        update the counts of the target.
+        Return the removed reaction type, None if there was no reaction.
+        """
+        target_column = "post_id" if post_id is not None else "comment_id"
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {cls._meta.db_table} "
+                f"WHERE owner_id = %s AND {target_column} = %s RETURNING type",
+                [owner_id, post_id or comment_id],
+            )
+            row = cursor.fetchone()
+            previous_type = row[0] if row is not None else None
+            cls.update_target_counts_on_change(previous_type, None, post_id, comment_id)
+
+        return previous_type
+
+    @staticmethod
+    def update_target_counts_in_bulk(changes):
+        """
+        Apply reaction type changes, given as (previous_type, new_type,
+        post_id, comment_id) tuples, to the counts of their targets in one
+        update per target model.
+        """
+        deltas = {Post: {}, Comment: {}}
+
+        for previous_type, new_type, post_id, comment_id in changes:
+            if previous_type == new_type:
+                continue
+
+            if post_id is not None:
+                target_deltas = deltas[Post].setdefault(post_id, {})
+            else:
+                target_deltas = deltas[Comment].setdefault(comment_id, {})
+
+            for reaction_type, step in ((previous_type, -1), (new_type, 1)):
+                if reaction_type is not None:
+                    count_field = Reaction.get_count_field(reaction_type)
+                    target_deltas[count_field] = (
+                        target_deltas.get(count_field, 0) + step
+                    )
+
+        for model, model_deltas in deltas.items():
+            if not model_deltas:
+                continue
+
+            counts = {
+                count_field: models.F(count_field)
+                + models.Case(
+                    *(
+                        models.When(
+                            pk=pk, then=models.Value(target_deltas[count_field])
+                        )
+                        for pk, target_deltas in model_deltas.items()
+                        if target_deltas.get(count_field)
+                    ),
+                    default=models.Value(0),
+                )
+                for count_field in ("like_count", "dislike_count")
+            }
+            model.objects.filter(pk__in=model_deltas).update(
+                **counts, version=models.F("version") + 1
+            )
+
+    @classmethod
+    def bulk_upsert(cls, owner_id, reactions):
+        """
+        Set the reactions of an owner to many targets, given as (type,
+        post_id, comment_id) tuples with distinct targets. The stored
+        reactions are read in one query, and new and changed ones are written
+        in one query each. The targets are not validated.
+        A concurrent reaction of the owner to a new target raises an
+        IntegrityError.
+        Return the previous reaction types, None where there was no reaction.
+        """
+        post_ids = [post_id for _, post_id, _ in reactions if post_id is not None]
+        comment_ids = [
+            comment_id for _, _, comment_id in reactions if comment_id is not None
+        ]
+        new_reactions = []
+        changed_ids = []
+        previous_types = []
+
+        with transaction.atomic():
+            stored = {
+                (post_id, comment_id): (pk, reaction_type)
+                for pk, reaction_type, post_id, comment_id in (
+                    cls.objects.select_for_update()
+                    .filter(owner_id=owner_id)
+                    .filter(
+                        models.Q(post_id__in=post_ids)
+                        | models.Q(comment_id__in=comment_ids)
+                    )
+                    .values_list("pk", "type", "post_id", "comment_id")
+                )
+            }
+
+            for reaction_type, post_id, comment_id in reactions:
+                pk, previous_type = stored.get((post_id, comment_id), (None, None))
+                previous_types.append(previous_type)
+
+                if pk is None:
+                    new_reactions.append(
+                        cls(
+                            owner_id=owner_id,
+                            type=reaction_type,
+                            post_id=post_id,
+                            comment_id=comment_id,
+                        )
+                    )
+                elif previous_type != reaction_type:
+                    changed_ids.append(pk)
+
+            cls.objects.bulk_create(new_reactions)
+
+            # There are two types, so a changed reaction flips its type
+            if changed_ids:
+                cls.objects.filter(pk__in=changed_ids).update(
+                    type=models.Case(
+                        models.When(
+                            type=cls.ReactionType.LIKE,
+                            then=models.Value(cls.ReactionType.DISLIKE),
+                        ),
+                        default=models.Value(cls.ReactionType.LIKE),
+                    )
+                )
+
+            cls.update_target_counts_in_bulk(
+                (previous_type, reaction_type, post_id, comment_id)
+                for previous_type, (reaction_type, post_id, comment_id) in zip(
+                    previous_types, reactions
+                )
+            )
+
+        return previous_types
+
+    @classmethod
+    def bulk_delete(cls, queryset, batch_size=500):
+        """
+        Delete the reactions of a queryset in batches of set based deletes,
+        without loading them, and update the counts of their targets.
+        Return the count of deleted reactions.
+        """
+        counts = {"reactions": 0}
+
+        while True:
+            with transaction.atomic():
+                # Locked so that the counted types are those deleted
+                rows = list(
+                    queryset.select_for_update(of=("self",)).values_list(
+                        "pk", "type", "post_id", "comment_id"
+                    )[:batch_size]
+                )
+
+                if not rows:
+                    break
+
+                counts["reactions"] += cls.objects.filter(
+                    pk__in=[pk for pk, _, _, _ in rows]
+                )._raw_delete(queryset.db)
+                cls.update_target_counts_in_bulk(
+                    (reaction_type, None, post_id, comment_id)
+                    for _, reaction_type, post_id, comment_id in rows
+                )
+
+        # The deletes bypass the Reaction signals, see posts.signals
+        if counts["reactions"]:
+            caching.invalidate("posts", "comments")
+
+        return counts
+
     def clean(self):
         super().clean()
 
-        if self.post and not self.post.publish_date:
-            raise ValidationError("A reaction cannot target a private post.")
+        if self.is_cleaned("post") and self.post_id is not None:
+            post = self.get_related("post")
 
-        if self.comment and not self.comment.post.publish_date:
-            raise ValidationError(
-                "A reaction cannot target a comment of a private post."
-            )
+            if post is not None and not post.publish_date:
+                raise ValidationError("A reaction cannot target a private post.")
+
+        if self.is_cleaned("comment") and self.comment_id is not None:
+            comment = self.get_related("comment")
+
+            if comment is not None and not comment.post.publish_date:
+                raise ValidationError(
+                    "A reaction cannot target a comment of a private post."
+                )
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        self.clean_on_save(kwargs.get("update_fields"))
+
+        with transaction.atomic():
+            previous = None
+
+            if not self._state.adding:
+                # Lock the stored row so that its counted values are reliable
+                previous = (
+                    Reaction.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values("type", "post_id", "comment_id")
+                    .first()
+                )
+
+            super().save(*args, **kwargs)
+            current = {
+                "type": self.type,
+                "post_id": self.post_id,
+                "comment_id": self.comment_id,
+            }
+
+            if previous == current:
+                return
+
+            if previous is not None:
+                Reaction.update_target_counts(
+                    previous["type"],
+                    post_id=previous["post_id"],
+                    comment_id=previous["comment_id"],
+                    step=-1,
+                )
+
+            Reaction.update_target_counts(
+                self.type, post_id=self.post_id, comment_id=self.comment_id
+            )
@@ -1,11 +1,13 @@
 from rest_framework import permissions as perms
 
+from ..core import roles
+
 
 class IsAuthor(perms.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.groups.filter(name="author").exists()
+        return roles.has_role(request.user, "author")
 
 
 class IsCommenter(perms.BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.groups.filter(name="commenter").exists()
+        return roles.has_role(request.user, "commenter")
@@ -0,0 +1,121 @@
+"""
+Full-text search of post titles and content.
+The index is a side table keyed by post id: an FTS5 virtual table on SQLite
+and a weighted tsvector with a GIN index on PostgreSQL. Titles weigh more than
+content in the relevance rank.
+"""
+
+import re
+
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+
+table_name = "posts_post_search"
+title_weight = 4.0
+content_weight = 1.0
+
+
+def create_index(schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE {table_name} ("
+            "post_id bigint PRIMARY KEY REFERENCES posts_post (id) "
+            "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {table_name}_document ON {table_name} USING GIN (document)"
+        )
+    else:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {table_name} USING fts5("
+            "title, content, tokenize='porter unicode61')"
+        )
+
+
+def drop_index(schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+
+# Rebuild the whole index from the posts table
+def rebuild_index(using_connection=connection):
+    with using_connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table_name}")
+
+        if using_connection.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {table_name} (post_id, document) "
+                f"SELECT id, {_document_sql('title', 'content')} FROM posts_post"
+            )
+        else:
+            cursor.execute(
+                f"INSERT INTO {table_name} (rowid, title, content) "
+                "SELECT id, title, content FROM posts_post"
+            )
+
+        return cursor.rowcount
+
+
+def index_post(post):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {table_name} (post_id, document) "
+                f"VALUES (%s, {_document_sql('%s', '%s')}) "
+                "ON CONFLICT (post_id) DO UPDATE SET document = excluded.document",
+                [post.pk, post.title, post.content],
+            )
+        else:
+            # FTS5 tables have no upsert
+            cursor.execute(f"DELETE FROM {table_name} WHERE rowid = %s", [post.pk])
+            cursor.execute(
+                f"INSERT INTO {table_name} (rowid, title, content) VALUES (%s, %s, %s)",
+                [post.pk, post.title, post.content],
+            )
+
+
+def unindex_post(post_id):
+    column = "post_id" if connection.vendor == "postgresql" else "rowid"
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table_name} WHERE {column} = %s", [post_id])
+
+
+# Filter posts to those matching every term of the query, annotated with
+# their relevance as search_rank (higher is more relevant).
+def search_posts(queryset, query):
+    terms = re.findall(r"\w+", query)
+
+    if not terms:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        match_sql = "document @@ plainto_tsquery('english', %s)"
+        rank_sql = (
+            f"SELECT ts_rank(document, plainto_tsquery('english', %s)) "
+            f"FROM {table_name} WHERE post_id = {table}.id"
+        )
+        matches_sql = f"SELECT post_id FROM {table_name} WHERE {match_sql}"
+        params = [" ".join(terms)]
+    else:
+        # Quoting the terms keeps FTS5 query syntax out of user input
+        match_sql = f"{table_name} MATCH %s"
+        rank_sql = (
+            f"SELECT -bm25({table_name}, {title_weight}, {content_weight}) "
+            f"FROM {table_name} WHERE {match_sql} AND rowid = {table}.id"
+        )
+        matches_sql = f"SELECT rowid FROM {table_name} WHERE {match_sql}"
+        params = [" ".join(f'"{term}"' for term in terms)]
+
+    return queryset.filter(pk__in=RawSQL(matches_sql, params)).annotate(
+        search_rank=RawSQL(rank_sql, params, output_field=models.FloatField())
+    )
+
+
+def _document_sql(title, content):
+    return (
+        f"setweight(to_tsvector('english', {title}), 'A') || "
+        f"setweight(to_tsvector('english', {content}), 'D')"
+    )
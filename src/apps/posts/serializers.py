@@ -1,3 +1,6 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from rest_framework import serializers as serials
 
 from ..core.serializers import base as base_serials
@@ -8,16 +11,21 @@ from . import models as app_models
 class TagSerializer(base_serials.HyperlinkedReprnModelSerializer):
     class Meta:
         model = app_models.Tag
-        fields = ["url", "title"]
+        fields = ["url", "title", "post_count", "published_post_count"]
 
 
-class PostSerializer(base_serials.HyperlinkedReprnModelSerializer):
+class PostSerializer(
+    serial_mixins.DynamicFieldsMixin,
+    serial_mixins.ChangedOnlyValidationMixin,
+    base_serials.HyperlinkedReprnModelSerializer,
+):
     owner = serials.ReadOnlyField(source="owner.username")
-    like_count = serials.IntegerField(read_only=True)
-    dislike_count = serials.IntegerField(read_only=True)
-    tags = serials.SlugRelatedField(
+    # Resolved in one query, then set with Post.set_tags rather than through
+    # the M2M manager
+    tags = base_serials.SlugRelatedField(
         many=True, slug_field="title", queryset=app_models.Tag.objects.all()
     )
+    comments_url = serials.HyperlinkedIdentityField(view_name="post-comments")
 
     class Meta:
         model = app_models.Post
@@ -26,23 +34,58 @@ class PostSerializer(base_serials.HyperlinkedReprnModelSerializer):
             "owner",
             "title",
             "thumbnail",
+            "thumbnail_status",
             "publish_date",
             "last_modified_date",
             "content",
+            "excerpt",
+            "reading_time",
             "like_count",
             "dislike_count",
             "tags",
+            "comment_count",
+            "comments_url",
+            # Only included when expanded, see PostViewSet
             "comments",
         ]
         read_only_fields = ["publish_date"]
+        # Validated over the network
+        validate_changed_only = ["thumbnail"]
+
+    # The tags are validated before the post is written. The publish date is
+    # read only, so it is that of the instance.
+    def validate_tags(self, tags):
+        post = self.instance or app_models.Post()
+
+        try:
+            post.check_tag_count(len(set(tags)))
+        except ValidationError as error:
+            raise serials.ValidationError(error.messages)
+
+        return tags
+
+    @transaction.atomic
+    def create(self, validated_data):
+        tags = validated_data.pop("tags")
+        post = super().create(validated_data)
+        post.set_tags(tags)
+        return post
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        tags = validated_data.pop("tags", None)
+        post = super().update(instance, validated_data)
+
+        if tags is not None:
+            post.set_tags(tags)
+
+        return post
 
 
 class CommentSerializer(
     serial_mixins.ImmutableFieldsMixin, base_serials.HyperlinkedReprnModelSerializer
 ):
     owner = serials.ReadOnlyField(source="owner.username")
-    like_count = serials.IntegerField(read_only=True)
-    dislike_count = serials.IntegerField(read_only=True)
 
     class Meta:
         model = app_models.Comment
@@ -57,6 +100,12 @@ class CommentSerializer(
             "dislike_count",
         ]
         immutable_fields = ["post", "reply_to"]
+        # Only what Comment.clean reads is loaded, and the loaded relations
+        # are not looked up again on save
+        extra_kwargs = {
+            "post": {"queryset": app_models.Post.objects.only("pk", "publish_date")},
+            "reply_to": {"queryset": app_models.Comment.objects.only("pk", "reply_to")},
+        }
 
 
 class ReactionSerializer(base_serials.HyperlinkedReprnModelSerializer):
@@ -65,8 +114,74 @@ class ReactionSerializer(base_serials.HyperlinkedReprnModelSerializer):
     class Meta:
         model = app_models.Reaction
         fields = ["url", "owner", "type", "post", "comment"]
+        # Only what Reaction.clean reads is loaded, see CommentSerializer
+        extra_kwargs = {
+            "post": {"queryset": app_models.Post.objects.only("pk", "publish_date")},
+            "comment": {
+                "queryset": app_models.Comment.objects.select_related("post").only(
+                    "pk", "post__publish_date"
+                )
+            },
+        }
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         rep["type"] = instance.get_type_display()
         return rep
+
+
+class ReactionTypeSerializer(serials.Serializer):
+    type = serials.ChoiceField(choices=app_models.Reaction.ReactionType.choices)
+
+
+# A reaction of a batch, see ReactionViewSet.batch. Targets are given by id so
+# that a batch is validated without resolving each target.
+class ReactionBatchItemSerializer(ReactionTypeSerializer):
+    post = serials.IntegerField(required=False, min_value=1)
+    comment = serials.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if ("post" in attrs) == ("comment" in attrs):
+            raise serials.ValidationError(
+                "A reaction must target either a post or a comment."
+            )
+
+        return attrs
+
+
+# The objects to delete by a moderator, see BulkDeleteMixin.
+# The criteria are combined, and at least one is required.
+class BulkDeleteSerializer(serials.Serializer):
+    lookups = {
+        "ids": "pk__in",
+        "owner": "owner",
+        "post": "post",
+        "created_after": "create_date__gte",
+        "created_before": "create_date__lte",
+    }
+
+    ids = serials.ListField(
+        child=serials.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+    owner = serials.SlugRelatedField(
+        slug_field="username", queryset=get_user_model().objects.all(), required=False
+    )
+    post = serials.IntegerField(min_value=1, required=False)
+    created_after = serials.DateField(required=False)
+    created_before = serials.DateField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serials.ValidationError(
+                f"At least one of {', '.join(self.lookups)} is required."
+            )
+
+        return attrs
+
+    def filter(self, queryset):
+        return queryset.filter(
+            **{
+                self.lookups[field_name]: value
+                for field_name, value in self.validated_data.items()
+            }
+        )
@@ -1,36 +1,211 @@
-from django.db.models.signals import m2m_changed
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from django.forms import ValidationError
 
+from ..core import caching
+from ..core import signals as core_signals
 from . import models as app_models
+from . import search
 
 """
-Enforce limits on the number of tags a post has.
+Enforce limits on the number of tags a post has, and keep the post counts of
+the tags in sync.
 The instance parameter is always of the Post model because the reverse
 M2M relationship from the Tag model is disabled.
+The pk_set of an add holds only the tags that are not yet on the post, but
+that of a remove may hold tags that are not on it, so the tags removed are
+found before the change.
 """
 
 
 @receiver(m2m_changed, sender=app_models.Post.tags.through)
 def clean_post_on_tags_change(sender, instance, action, pk_set, **kwargs):
-    if action == "pre_add":
-        current_tag_count = instance.tags.count()
-        new_tag_count = current_tag_count + len(pk_set)
-        max_tag_count = 5
+    published_step = 1 if instance.publish_date is not None else 0
 
-        if new_tag_count > max_tag_count:
-            raise ValidationError(f"A post must have at most {max_tag_count} tag(s).")
+    if action == "pre_add":
+        instance.check_tag_count(instance.tags.count() + len(pk_set))
 
     elif action == "pre_remove":
-        # Min limit is not enforced when post is not published
-        if instance.publish_date is None:
-            return
-
-        current_tag_count = instance.tags.count()
-        new_tag_count = current_tag_count - len(pk_set)
-        min_tag_count = 1
-
-        if new_tag_count < min_tag_count:
-            raise ValidationError(
-                f"A published post must have at least {min_tag_count} tag(s)."
-            )
+        current_tag_ids = set(instance.tags.values_list("pk", flat=True))
+        instance._removed_tag_ids = current_tag_ids & pk_set
+        instance.check_tag_count(len(current_tag_ids) - len(instance._removed_tag_ids))
+
+    elif action == "pre_clear":
+        instance._removed_tag_ids = set(instance.tags.values_list("pk", flat=True))
+
+    elif action == "post_add":
+        app_models.Tag.update_post_counts(pk_set, step=1, published_step=published_step)
+
+    elif action in ("post_remove", "post_clear"):
+        app_models.Tag.update_post_counts(
+            instance.__dict__.pop("_removed_tag_ids"),
+            step=-1,
+            published_step=-published_step,
+        )
+
+
+"""
+Keep the post counts of tags in sync when a post is deleted. The deletion
+collector removes the post's tags without M2M signals, after this signal.
+"""
+
+
+@receiver(pre_delete, sender=app_models.Post)
+def update_tag_counts_on_post_delete(sender, instance, **kwargs):
+    app_models.Tag.update_post_counts(
+        app_models.Post.tags.through.objects.filter(post=instance).values("tag"),
+        step=-1,
+        published_step=-1 if instance.publish_date is not None else 0,
+    )
+
+
+"""
+Keep the reaction counts of a reaction target, and the comment count of a
+post, in sync when a reaction or comment is deleted. Deletes are always
+wrapped in a transaction by the deletion collector.
+The counts of a target deleted along with its reactions or comments are not
+updated. The targets of a delete are marked on its origin, the instance or
+queryset deleted, since the collector sends all pre_delete signals before it
+deletes any row.
+"""
+
+
+@receiver(pre_delete, sender=app_models.Post)
+@receiver(pre_delete, sender=app_models.Comment)
+def mark_deleted_target(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        deleted_targets = origin.__dict__.setdefault("_deleted_targets", set())
+        deleted_targets.add((sender, instance.pk))
+
+
+def is_deleted_target(origin, model, pk):
+    return (model, pk) in getattr(origin, "_deleted_targets", ())
+
+
+@receiver(post_delete, sender=app_models.Reaction)
+def update_counts_on_reaction_delete(sender, instance, origin=None, **kwargs):
+    if is_deleted_target(origin, app_models.Post, instance.post_id):
+        return
+
+    if is_deleted_target(origin, app_models.Comment, instance.comment_id):
+        return
+
+    app_models.Reaction.update_target_counts(
+        instance.type,
+        post_id=instance.post_id,
+        comment_id=instance.comment_id,
+        step=-1,
+    )
+
+
+@receiver(post_delete, sender=app_models.Comment)
+def update_count_on_comment_delete(sender, instance, origin=None, **kwargs):
+    if is_deleted_target(origin, app_models.Post, instance.post_id):
+        return
+
+    app_models.Post.objects.filter(pk=instance.post_id).update(
+        comment_count=models.F("comment_count") - 1,
+        version=models.F("version") + 1,
+    )
+
+
+"""
+Remove deleted posts from the search index.
+"""
+
+
+@receiver(post_delete, sender=app_models.Post)
+def unindex_on_post_delete(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+
+
+"""
+Increment the version of posts whose tags change, since the tag titles are
+part of the post representation.
+"""
+
+
+@receiver(m2m_changed, sender=app_models.Post.tags.through)
+def update_version_on_tags_change(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        app_models.Post.objects.filter(pk=instance.pk).update(
+            version=models.F("version") + 1
+        )
+
+
+@receiver(post_save, sender=app_models.Tag)
+def update_version_on_tag_change(sender, instance, created, **kwargs):
+    if not created:
+        app_models.Post.objects.filter(tags=instance).update(
+            version=models.F("version") + 1
+        )
+
+
+"""
+Increment the version of posts and comments whose owner changes username or
+is deleted, since the owner username is part of their representation. The
+owner of a deleted user's rows is set to null by the deletion collector after
+pre_delete, so the rows are found before.
+"""
+
+
+def update_owned_versions(user):
+    for model in (app_models.Post, app_models.Comment):
+        model.objects.filter(owner=user).update(version=models.F("version") + 1)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_version_on_username_change(sender, instance, **kwargs):
+    if core_signals.username_changed(instance):
+        update_owned_versions(instance)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def update_version_on_owner_delete(sender, instance, **kwargs):
+    update_owned_versions(instance)
+
+
+"""
+Invalidate the cached responses that include a model when it changes.
+Comments are listed only if their post is visible, posts include their
+tags and the counts of their comments and reactions, and tags include the
+counts of their posts.
+"""
+
+cache_dependents = {
+    app_models.Post: ("posts", "comments", "tags"),
+    app_models.Tag: ("tags", "posts"),
+    app_models.Comment: ("comments", "posts"),
+    app_models.Reaction: ("posts", "comments"),
+}
+
+
+@receiver(post_save, sender=app_models.Post)
+@receiver(post_save, sender=app_models.Tag)
+@receiver(post_save, sender=app_models.Comment)
+@receiver(post_save, sender=app_models.Reaction)
+@receiver(post_delete, sender=app_models.Post)
+@receiver(post_delete, sender=app_models.Tag)
+@receiver(post_delete, sender=app_models.Comment)
+@receiver(post_delete, sender=app_models.Reaction)
+def invalidate_cache_on_change(sender, **kwargs):
+    caching.invalidate(*cache_dependents[sender])
+
+
+@receiver(m2m_changed, sender=app_models.Post.tags.through)
+def invalidate_cache_on_tags_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        caching.invalidate("posts", "tags")
+
+
+# Posts and comments include the username of their owner
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_cache_on_username_change(sender, instance, **kwargs):
+    if core_signals.username_changed(instance):
+        caching.invalidate("posts", "comments")
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cache_on_owner_delete(sender, instance, **kwargs):
+    caching.invalidate("posts", "comments")
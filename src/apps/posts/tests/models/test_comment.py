@@ -1,7 +1,9 @@
 from unittest import mock
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from ....core import model_factories as core_factories
 from ... import model_factories as posts_factories
@@ -65,3 +67,53 @@ class CommentModelTest(TestCase):
         error_messages = context.exception.messages
         self.assertEqual(len(error_messages), 1)
         self.assertEqual(error_messages[0], "A comment cannot be a reply to a reply.")
+
+    def test_comment_count(self):
+        comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        posts_factories.CommentFactory(
+            owner=self.user1, post=self.post, reply_to=comment
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+
+        # Deleting a comment also deletes its reply
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    def test_save_uses_loaded_relations(self):
+        post = posts_models.Post.objects.only("pk", "publish_date").get(pk=self.post.pk)
+        comment = posts_models.Comment(owner=self.user1, post=post, content="Hi")
+
+        with CaptureQueriesContext(connection) as context:
+            comment.save()
+
+        selects = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(selects, [])
+
+    def test_update_skips_relation_checks(self):
+        parent = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        posts_factories.CommentFactory(
+            owner=self.user1, post=self.post, reply_to=parent
+        )
+        reply = posts_models.Comment.objects.get(reply_to=parent)
+
+        for update_fields in (["content"], None):
+            reply.content = "Edited"
+
+            with CaptureQueriesContext(connection) as context:
+                reply.save(update_fields=update_fields)
+
+            relation_selects = [
+                query["sql"]
+                for query in context.captured_queries
+                if query["sql"].startswith("SELECT")
+                and (
+                    '"publish_date"' in query["sql"] or '"reply_to_id"' in query["sql"]
+                )
+            ]
+            self.assertEqual(relation_selects, [])
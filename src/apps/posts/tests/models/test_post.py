@@ -1,9 +1,12 @@
 from unittest import mock
 
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from ....core import model_factories as core_factories
+from ....core.models import ImageStatus
 from ... import model_factories as posts_factories
 from ... import models as posts_models
 
@@ -68,3 +71,151 @@ class PostModelTest(TestCase):
         error_messages = context.exception.messages
         self.assertEqual(len(error_messages), 1)
         self.assertEqual(error_messages[0], "A post must have at most 5 tag(s).")
+
+    def test_set_tags(self):
+        tag2, tag3 = posts_factories.TagFactory(), posts_factories.TagFactory()
+
+        with CaptureQueriesContext(connection) as context:
+            self.post.set_tags([tag2.title, tag3.title])
+
+        through_writes = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(("INSERT", "DELETE"))
+            and '"posts_post_tags"' in query["sql"]
+        ]
+        self.assertEqual(len(through_writes), 2)
+        self.assertEqual(
+            set(self.post.tags.values_list("pk", flat=True)), {tag2.pk, tag3.pk}
+        )
+
+        for tag, counts in ((self.tag1, (0, 0)), (tag2, (1, 1)), (tag3, (1, 1))):
+            tag.refresh_from_db()
+            self.assertEqual((tag.post_count, tag.published_post_count), counts)
+
+        # An unchanged set writes nothing
+        with CaptureQueriesContext(connection) as context:
+            self.post.set_tags([tag3.title, tag2.title])
+
+        self.assertFalse(
+            [
+                query
+                for query in context.captured_queries
+                if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            ]
+        )
+
+    def test_set_tags_invalid(self):
+        tags = [posts_factories.TagFactory() for _ in range(6)]
+        cases = [
+            ([], "A published post must have at least 1 tag(s)."),
+            ([tag.title for tag in tags], "A post must have at most 5 tag(s)."),
+            (["missing"], "Tag with title=missing does not exist."),
+        ]
+
+        for titles, message in cases:
+            with self.assertRaises(ValidationError) as context:
+                self.post.set_tags(titles)
+
+            self.assertEqual(context.exception.messages, [message])
+
+        self.assertEqual(list(self.post.tags.all()), [self.tag1])
+
+    def test_delete_skips_counts_of_deleted_targets(self):
+        comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+
+        for target in {"post": self.post}, {"comment": comment}:
+            posts_models.Reaction.objects.create(
+                owner=self.user1,
+                type=posts_models.Reaction.ReactionType.LIKE,
+                **target,
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            self.post.delete()
+
+        self.assertFalse(
+            any(
+                query["sql"].startswith("UPDATE")
+                and (
+                    '"posts_post"' in query["sql"] or '"posts_comment"' in query["sql"]
+                )
+                for query in context.captured_queries
+            )
+        )
+        self.assertFalse(posts_models.Comment.objects.exists())
+
+    def test_summary_on_save(self):
+        self.post.content = " ".join(["word"] * 1000)
+        self.post.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.reading_time, 5)
+        self.assertLessEqual(len(self.post.excerpt), posts_models.Post.excerpt_length)
+        self.assertTrue(self.post.excerpt.startswith("word word"))
+
+    def test_summary_on_save_update_fields(self):
+        self.post.content = " ".join(["wordy"] * 401)
+        self.post.save(update_fields=["content"])
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.reading_time, 3)
+
+    def test_thumbnail_status_on_save(self):
+        self.assertEqual(self.post.thumbnail_status, ImageStatus.PENDING)
+        posts_models.Post.objects.filter(pk=self.post.pk).update(
+            thumbnail_status=ImageStatus.VERIFIED
+        )
+        post = posts_models.Post.objects.get(pk=self.post.pk)
+
+        # Unchanged thumbnails keep their status
+        post.title = "An unrelated change of the title"
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.thumbnail_status, ImageStatus.VERIFIED)
+
+        post.thumbnail = "https://fake-url.com/media/other.webp"
+        post.save(update_fields=["thumbnail"])
+        post.refresh_from_db()
+        self.assertEqual(post.thumbnail_status, ImageStatus.PENDING)
+
+    @override_settings(PUBLISH_REQUIRES_VERIFIED_THUMBNAIL=True)
+    def test_publish_requires_verified_thumbnail(self):
+        post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            publish_date=None,
+            tags=[self.tag1],
+        )
+        post.publish_date = self.post.publish_date
+
+        with self.assertRaisesMessage(
+            ValidationError,
+            "A post can only be published once its thumbnail is verified.",
+        ):
+            post.save()
+
+        posts_models.Post.objects.filter(pk=post.pk).update(
+            thumbnail_status=ImageStatus.VERIFIED
+        )
+        post.refresh_from_db()
+
+        # A new thumbnail is pending again
+        post.publish_date = self.post.publish_date
+        post.thumbnail = "https://fake-url.com/media/new.webp"
+
+        with self.assertRaisesMessage(
+            ValidationError,
+            "A post can only be published once its thumbnail is verified.",
+        ):
+            post.save()
+
+        post.refresh_from_db()
+        post.publish_date = self.post.publish_date
+        post.save()
+
+        # Published posts are not unpublished by a pending thumbnail
+        post.thumbnail = "https://fake-url.com/media/other.webp"
+        post.save()
+        post.title = "An unrelated change of the title"
+        post.save()
@@ -1,7 +1,9 @@
 from unittest import mock
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from ....core import model_factories as core_factories
 from ... import model_factories as posts_factories
@@ -95,3 +97,75 @@ class ReactionModelTest(TestCase):
         self.assertEqual(
             error_messages[0], "A reaction cannot target a comment of a private post."
         )
+
+    def test_counts_on_create(self):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count + self.post.dislike_count, 1)
+
+        comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        posts_factories.ReactionFactory(
+            owner=self.user1,
+            comment=comment,
+            type=posts_models.Reaction.ReactionType.DISLIKE,
+        )
+
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 0)
+        self.assertEqual(comment.dislike_count, 1)
+
+    def test_counts_on_type_flip(self):
+        self.post_reaction.type = posts_models.Reaction.ReactionType.LIKE
+        self.post_reaction.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (1, 0))
+
+        self.post_reaction.type = posts_models.Reaction.ReactionType.DISLIKE
+        self.post_reaction.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (0, 1))
+
+    def test_counts_on_delete(self):
+        self.post_reaction.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (0, 0))
+
+    def test_counts_not_overwritten_by_stale_target(self):
+        stale_post = posts_models.Post.objects.get(pk=self.post.pk)
+        user2 = core_factories.UserFactory()
+        posts_factories.ReactionFactory(owner=user2, post=self.post)
+
+        stale_post.title = "This title is at least min length"
+        stale_post.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count + self.post.dislike_count, 2)
+
+    def test_comment_target_checked_in_one_query(self):
+        comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        reaction = posts_models.Reaction(
+            owner=self.user1,
+            comment_id=comment.pk,
+            type=posts_models.Reaction.ReactionType.LIKE,
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            reaction.save()
+
+        target_selects = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+            and '"posts_comment"' in query["sql"].split("WHERE")[0]
+        ]
+        self.assertEqual(len(target_selects), 1)
+        self.assertIn('"posts_post"', target_selects[0])
+
+    def test_type_update_skips_target_checks(self):
+        self.post.publish_date = None
+        self.post.save()
+        reaction = posts_models.Reaction.objects.get(pk=self.post_reaction.pk)
+        reaction.type = posts_models.Reaction.ReactionType.LIKE
+
+        # The target is only validated when it is saved
+        reaction.save(update_fields=["type"])
+        reaction.refresh_from_db()
+        self.assertEqual(reaction.type, posts_models.Reaction.ReactionType.LIKE)
@@ -1,11 +1,27 @@
+from unittest import mock
+
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 from django.test import TestCase
 
+from ....core import model_factories as core_factories
 from ... import model_factories as posts_factories
+from ... import models as posts_models
 
 
 class TagModelTest(TestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        return super().setUp()
+
     def test_constraint_lowercase_title(self):
         with self.assertRaises(IntegrityError) as context:
             posts_factories.TagFactory(title="UPPERCASE")
@@ -28,3 +44,66 @@ class TagModelTest(TestCase):
             error_messages[0],
             "Tag title must only contain letters, numbers, and hyphens.",
         )
+
+    def test_post_counts(self):
+        def assert_counts(tag, post_count, published_post_count):
+            tag.refresh_from_db()
+            self.assertEqual(tag.post_count, post_count)
+            self.assertEqual(tag.published_post_count, published_post_count)
+
+        tag1 = posts_factories.TagFactory()
+        tag2 = posts_factories.TagFactory()
+        user = core_factories.UserFactory()
+        post = posts_factories.PostFactory(
+            owner=user,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[tag1, tag2],
+        )
+        private_post = posts_factories.PostFactory(
+            owner=user, thumbnail="", publish_date=None, tags=[tag1]
+        )
+        assert_counts(tag1, 2, 1)
+        assert_counts(tag2, 1, 1)
+
+        # Adding a present tag and removing an absent one change nothing
+        post.tags.add(tag1)
+        private_post.tags.remove(tag2)
+        assert_counts(tag1, 2, 1)
+        assert_counts(tag2, 1, 1)
+
+        post.tags.remove(tag2)
+        assert_counts(tag2, 0, 0)
+
+        # Publishing and unpublishing
+        private_post.publish_date = post.publish_date
+        private_post.thumbnail = post.thumbnail
+        private_post.save()
+        assert_counts(tag1, 2, 2)
+
+        private_post = posts_models.Post.objects.get(pk=private_post.pk)
+        private_post.publish_date = None
+        private_post.save(update_fields=["publish_date"])
+        assert_counts(tag1, 2, 1)
+
+        private_post.tags.clear()
+        assert_counts(tag1, 1, 1)
+
+        post.delete()
+        assert_counts(tag1, 0, 0)
+
+    def test_counts_not_overwritten_by_stale_tag(self):
+        tag = posts_factories.TagFactory()
+        stale_tag = posts_models.Tag.objects.get(pk=tag.pk)
+        posts_factories.PostFactory(
+            owner=core_factories.UserFactory(),
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[tag],
+        )
+
+        stale_tag.title = "renamed"
+        stale_tag.save()
+
+        tag.refresh_from_db()
+        self.assertEqual(tag.title, "renamed")
+        self.assertEqual(tag.post_count, 1)
+        self.assertEqual(tag.published_post_count, 1)
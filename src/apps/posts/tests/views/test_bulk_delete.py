@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ....core import model_factories as core_factories
+from ....core.tests import utils as test_utils
+from ... import model_factories as posts_factories
+from ... import models as posts_models
+
+
+class BulkDeleteTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.spammer = core_factories.UserFactory()
+        self.moderator = core_factories.UserFactory()
+        self.moderator.groups.add(Group.objects.create(name="moderator"))
+        self.post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        self.comment_url = reverse("comment-bulk-delete")
+        self.reaction_url = reverse("reaction-bulk-delete")
+        return super().setUp()
+
+    def test_post_not_moderator(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        for url in (self.comment_url, self.reaction_url):
+            with self.assertLogs("django.request", level="WARNING"):
+                res = self.client.post(url, {"ids": [1]}, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_post_no_criteria(self):
+        test_utils.jwt_login(self.client, self.moderator.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.comment_url, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(posts_models.Comment.objects.exists())
+
+    def test_post_comments_by_owner(self):
+        spam = posts_factories.CommentFactory(owner=self.spammer, post=self.post)
+        # Replies to spam are deleted with it, whoever owns them
+        posts_factories.CommentFactory(owner=self.user1, post=self.post, reply_to=spam)
+        posts_factories.CommentFactory(
+            owner=self.spammer, post=self.post, reply_to=self.comment
+        )
+        posts_factories.ReactionFactory(owner=self.user1, comment=spam)
+        test_utils.jwt_login(self.client, self.moderator.username)
+
+        res = self.client.post(
+            self.comment_url, {"owner": self.spammer.username}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"comments": 3, "reactions": 1})
+        self.assertEqual(list(posts_models.Comment.objects.all()), [self.comment])
+        self.assertFalse(posts_models.Reaction.objects.exists())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_post_reactions(self):
+        reactions = [
+            posts_factories.ReactionFactory(
+                owner=user,
+                post=self.post,
+                type=posts_models.Reaction.ReactionType.LIKE,
+            )
+            for user in (self.user1, self.spammer)
+        ]
+        posts_factories.ReactionFactory(
+            owner=self.spammer,
+            comment=self.comment,
+            type=posts_models.Reaction.ReactionType.DISLIKE,
+        )
+        test_utils.jwt_login(self.client, self.moderator.username)
+
+        res = self.client.post(
+            self.reaction_url,
+            {"owner": self.spammer.username, "created_after": "2000-01-01"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"reactions": 2})
+        self.assertEqual(list(posts_models.Reaction.objects.all()), reactions[:1])
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (1, 0))
+        self.assertEqual((self.comment.like_count, self.comment.dislike_count), (0, 0))
+
+        res = self.client.post(
+            self.reaction_url, {"ids": [reactions[0].id]}, format="json"
+        )
+        self.assertEqual(res.data, {"reactions": 1})
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count), (0, 0))
@@ -227,3 +227,15 @@ class CommentDetailTest(APITestCase):
 
         with self.assertRaises(posts_models.Comment.DoesNotExist):
             self.comment.refresh_from_db()
+
+    def test_get_guest_conditional(self):
+        etag = self.client.get(self.comment_url)["ETag"]
+
+        res = self.client.get(self.comment_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.comment.content = "Edited content"
+        self.comment.save()
+        res = self.client.get(self.comment_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["content"], "Edited content")
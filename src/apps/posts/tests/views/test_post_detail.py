@@ -1,6 +1,8 @@
 from unittest import mock
 
 from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -125,6 +127,28 @@ class PostDetailTest(APITestCase):
         self.public_post.refresh_from_db()
         self.assertEqual(self.public_post.title, new_title)
 
+    def test_patch_tags_login_public_post_owner(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        new_tag = posts_factories.TagFactory()
+
+        res = self.client.patch(
+            self.public_url, {"tags": [new_tag.title]}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["tags"], [new_tag.title])
+        self.assertEqual(list(self.public_post.tags.all()), [new_tag])
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.patch(
+                self.public_url, {"tags": ["missing"]}, format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tags"], {0: ["Object with title=missing does not exist."]}
+        )
+        self.assertEqual(list(self.public_post.tags.all()), [new_tag])
+
     def test_patch_login_public_post_owner(self):
         test_utils.jwt_login(self.client, self.user1.username)
 
@@ -205,3 +229,114 @@ class PostDetailTest(APITestCase):
 
         with self.assertRaises(posts_models.Post.DoesNotExist):
             self.public_post.refresh_from_db()
+
+    def test_get_guest_comments(self):
+        comment = posts_factories.CommentFactory(
+            owner=self.user1, post=self.public_post
+        )
+
+        res = self.client.get(self.public_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["comment_count"], 1)
+        self.assertNotIn("comments", res.data)
+
+        res = self.client.get(res.data["comments_url"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+        comment_id = test_utils.last_url_pk(res.data["results"][0]["url"])
+        self.assertEqual(comment.id, comment_id)
+
+    def test_get_guest_expand_comments(self):
+        comment = posts_factories.CommentFactory(
+            owner=self.user1, post=self.public_post
+        )
+
+        res = self.client.get(self.public_url, {"expand": "comments"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["comments"]), 1)
+        self.assertEqual(test_utils.last_url_pk(res.data["comments"][0]), comment.id)
+
+    def test_get_guest_private_post_comments(self):
+        private_post = posts_factories.PostFactory(
+            owner=self.user1, thumbnail="", publish_date=None
+        )
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(
+                reverse("post-comments", kwargs={"pk": private_post.id})
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_guest_conditional(self):
+        res = self.client.get(self.public_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        select_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and "silk_" not in query["sql"]
+        ]
+        self.assertEqual(len(select_queries), 1)
+        self.assertIn('"posts_post"."version"', select_queries[0])
+
+    def test_get_guest_conditional_changed(self):
+        etag = self.client.get(self.public_url)["ETag"]
+
+        # A reaction changes the counts in the representation
+        posts_factories.ReactionFactory(owner=self.user1, post=self.public_post)
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # So does a change of tags
+        self.public_post.tags.add(posts_factories.TagFactory())
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # And so does an edit
+        self.public_post.title = "This title is at least min length"
+        self.public_post.save()
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # A save that keeps the owner username does not
+        self.user1.set_password("new password")
+        self.user1.save()
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # And so does a change of the owner username
+        self.user1.username = "renamed"
+        self.user1.save()
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # And so does the deletion of the owner
+        self.user1.delete()
+        res = self.client.get(self.public_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_get_guest_conditional_private_post(self):
+        private_post = posts_factories.PostFactory(
+            owner=self.user1, thumbnail="", publish_date=None
+        )
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(self.get_url(private_post.id), HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
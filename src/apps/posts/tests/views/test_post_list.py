@@ -1,11 +1,14 @@
 from unittest import mock
 
 from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from ....core import model_factories as core_factories
+from ....core import pagination as core_pagination
 from ....core.tests import utils as test_utils
 from ... import model_factories as posts_factories
 from ... import models as posts_models
@@ -85,6 +88,19 @@ class PostListTest(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertTrue(posts_models.Post.objects.filter(title=title).exists())
 
+    def test_post_login_invalid_tags(self):
+        test_utils.jwt_login(self.client, self.user1.username)
+        title = "This title is at least min length"
+
+        for data in ({"title": title}, {"title": title, "tags": ["missing"]}):
+            with self.assertLogs("django.request", level="WARNING"):
+                res = self.client.post(self.url, data, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("tags", res.data)
+            # The tags are validated before the post is written
+            self.assertFalse(posts_models.Post.objects.filter(title=title).exists())
+
     def test_put_patch_delete_login(self):
         test_utils.jwt_login(self.client, self.user1.username)
 
@@ -106,3 +122,206 @@ class PostListTest(APITestCase):
             res = self.client.post(self.url)
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @mock.patch.object(core_pagination.KeysetPagination, "page_size", 2)
+    def test_get_login_cursor(self):
+        # Same titles and dates force the ordering onto the pk tiebreaker,
+        # and private posts have a null publish date
+        for publish_date in ["2024-01-01", "2024-01-01", None, None]:
+            posts_factories.PostFactory(
+                owner=self.user2,
+                title=self.public_post.title,
+                thumbnail="https://fake-url.com/media/thumbnail.webp",
+                publish_date=publish_date,
+                tags=[posts_factories.TagFactory()],
+            )
+
+        test_utils.jwt_login(self.client, self.user2.username)
+        expected_ids = [
+            test_utils.last_url_pk(post["url"])
+            for post in self.client.get(self.url).data["results"]
+        ]
+        self.assertEqual(len(expected_ids), 6)
+
+        url = f"{self.url}?cursor="
+        pages = []
+
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                res = self.client.get(url)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertNotIn("count", res.data)
+                pages.append(res.data)
+                url = res.data["next"]
+
+        ids = [
+            test_utils.last_url_pk(post["url"])
+            for page in pages
+            for post in page["results"]
+        ]
+        self.assertEqual(ids, expected_ids)
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in context.captured_queries)
+        )
+
+        # Walk back from the last page
+        url = pages[-1]["previous"]
+        ids = [test_utils.last_url_pk(post["url"]) for post in pages[-1]["results"]]
+
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids = [
+                test_utils.last_url_pk(post["url"]) for post in res.data["results"]
+            ] + ids
+            url = res.data["previous"]
+
+        self.assertEqual(ids, expected_ids)
+
+    def test_get_guest_cursor_invalid(self):
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_guest_summary(self):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        post_data = res.data["results"][0]
+        self.assertNotIn("content", post_data)
+        self.assertEqual(post_data["excerpt"], self.public_post.excerpt)
+        self.assertEqual(post_data["reading_time"], self.public_post.reading_time)
+
+        post_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and 'FROM "posts_post"' in query["sql"]
+        ]
+        self.assertTrue(post_queries)
+        self.assertFalse(any('"content"' in sql for sql in post_queries))
+
+    def test_get_guest_full(self):
+        res = self.client.get(self.url, {"view": "full"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["content"], self.public_post.content)
+
+    def test_get_guest_search(self):
+        # A title match ranks above a content match
+        content_match = posts_factories.PostFactory(
+            owner=self.user1,
+            title="An unrelated title for ranking",
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            content=f"{'wordy ' * 400}kubernetes",
+            tags=[posts_factories.TagFactory()],
+        )
+        title_match = posts_factories.PostFactory(
+            owner=self.user1,
+            title="Scaling Kubernetes clusters",
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            content="wordy " * 401,
+            tags=[posts_factories.TagFactory()],
+        )
+
+        res = self.client.get(self.url, {"search": "kubernetes"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [test_utils.last_url_pk(post["url"]) for post in res.data["results"]]
+        self.assertEqual(ids, [title_match.id, content_match.id])
+
+        # Query syntax is not interpreted
+        res = self.client.get(self.url, {"search": 'kubernetes" OR'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [])
+
+    def test_get_guest_search_synced(self):
+        self.public_post.title = "Indexing with inverted indexes"
+        self.public_post.save(update_fields=["title"])
+
+        res = self.client.get(self.url, {"search": "inverted"})
+        self.assertEqual(len(res.data["results"]), 1)
+
+        self.public_post.delete()
+
+        res = self.client.get(self.url, {"search": "inverted"})
+        self.assertEqual(res.data["results"], [])
+
+    @mock.patch.object(core_pagination.KeysetPagination, "page_size", 1)
+    def test_get_guest_search_cursor(self):
+        for _ in range(2):
+            posts_factories.PostFactory(
+                owner=self.user1,
+                title="Caching search results",
+                thumbnail="https://fake-url.com/media/thumbnail.webp",
+                tags=[posts_factories.TagFactory()],
+            )
+
+        url = f"{self.url}?search=caching&cursor="
+        ids = []
+
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [test_utils.last_url_pk(post["url"]) for post in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(set(ids)), 2)
+
+    def test_get_guest_tag(self):
+        tag1, tag2 = self.public_post.tags.get(), posts_factories.TagFactory()
+        both_tags_post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[tag1, tag2],
+        )
+        tag2_post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[tag2],
+        )
+
+        def get_ids(params):
+            res = self.client.get(self.url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return sorted(
+                test_utils.last_url_pk(post["url"]) for post in res.data["results"]
+            )
+
+        any_ids = sorted([self.public_post.id, both_tags_post.id, tag2_post.id])
+        self.assertEqual(get_ids({"tag": [tag1.title, tag2.title]}), any_ids)
+        self.assertEqual(get_ids({"tag": f"{tag1.title},{tag2.title}"}), any_ids)
+        self.assertEqual(
+            get_ids({"tag": [tag1.title, tag2.title], "tag_mode": "all"}),
+            [both_tags_post.id],
+        )
+
+        # Titles are resolved in one query, and posts are not joined to tags
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {"tag": [tag1.title, tag2.title]})
+
+        tag_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+            and '"posts_tag"."title" IN' in query["sql"]
+        ]
+        self.assertEqual(len(tag_queries), 1)
+        self.assertFalse(
+            any(
+                'INNER JOIN "posts_post_tags"' in query["sql"]
+                for query in context.captured_queries
+                if query["sql"].startswith('SELECT "posts_post"')
+            )
+        )
+
+    def test_get_guest_tag_invalid(self):
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(self.url, {"tag": "no-such-tag"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(self.url, {"tag_mode": "some"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,151 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ....core import model_factories as core_factories
+from ....core.tests import utils as test_utils
+from ... import model_factories as posts_factories
+from ... import models as posts_models
+
+
+class ReactionBatchTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.posts = [
+            posts_factories.PostFactory(
+                owner=self.user1,
+                thumbnail="https://fake-url.com/media/thumbnail.webp",
+                tags=[posts_factories.TagFactory()],
+            )
+            for _ in range(3)
+        ]
+        self.comment = posts_factories.CommentFactory(
+            owner=self.user1, post=self.posts[0]
+        )
+        self.url = reverse("reaction-batch")
+        return super().setUp()
+
+    def get_counts(self, target):
+        target.refresh_from_db()
+        return (target.like_count, target.dislike_count)
+
+    def test_post_guest(self):
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.url, [], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_post_not_list(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.post(self.url, {"post": 1, "type": "L"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_results(self):
+        posts_factories.ReactionFactory(
+            owner=self.user2,
+            post=self.posts[1],
+            type=posts_models.Reaction.ReactionType.LIKE,
+        )
+        posts_factories.ReactionFactory(
+            owner=self.user2,
+            post=self.posts[2],
+            type=posts_models.Reaction.ReactionType.LIKE,
+        )
+        private_post = posts_factories.PostFactory(
+            owner=self.user2,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            publish_date=None,
+            tags=[],
+        )
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        res = self.client.post(
+            self.url,
+            [
+                {"post": self.posts[0].id, "type": "D"},
+                {"post": self.posts[0].id, "type": "L"},
+                {"post": self.posts[1].id, "type": "D"},
+                {"post": self.posts[2].id, "type": "L"},
+                {"comment": self.comment.id, "type": "D"},
+                {"post": private_post.id, "type": "L"},
+                {"post": self.posts[0].id, "comment": self.comment.id, "type": "L"},
+                {"post": self.posts[0].id, "type": "X"},
+            ],
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in res.data],
+            [
+                "superseded",
+                "created",
+                "updated",
+                "unchanged",
+                "created",
+                "not_found",
+                "invalid",
+                "invalid",
+            ],
+        )
+
+        self.assertEqual(self.get_counts(self.posts[0]), (1, 0))
+        self.assertEqual(self.get_counts(self.posts[1]), (0, 1))
+        self.assertEqual(self.get_counts(self.posts[2]), (1, 0))
+        self.assertEqual(self.get_counts(self.comment), (0, 1))
+        self.assertEqual(self.get_counts(private_post), (0, 0))
+        self.assertEqual(
+            posts_models.Reaction.objects.filter(owner=self.user2).count(), 4
+        )
+
+    def test_post_query_count_independent_of_size(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+        posts = self.posts + [
+            posts_factories.PostFactory(
+                owner=self.user1,
+                thumbnail="https://fake-url.com/media/thumbnail.webp",
+                tags=[posts_factories.TagFactory()],
+            )
+            for _ in range(3)
+        ]
+        query_counts = []
+
+        for batch_posts in (posts[:3], posts[3:]):
+            data = [{"post": post.id, "type": "L"} for post in batch_posts[:1]]
+            data += [{"post": post.id, "type": "D"} for post in batch_posts[1:]]
+
+            with CaptureQueriesContext(connection) as context:
+                res = self.client.post(self.url, data, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            query_counts.append(
+                len(
+                    [
+                        query
+                        for query in context.captured_queries
+                        if "silk_" not in query["sql"]
+                    ]
+                )
+            )
+
+        # Three-item batches, and six items in total, issue the same queries
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(
+            posts_models.Reaction.objects.filter(owner=self.user2).count(), 6
+        )
@@ -5,6 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from ....core import model_factories as core_factories
+from ....core import pagination as core_pagination
 from ....core.tests import utils as test_utils
 from ... import model_factories as posts_factories
 from ... import models as posts_models
@@ -100,3 +101,26 @@ class ReactionListTest(APITestCase):
                 res = method_func(self.url)
 
             self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @mock.patch.object(core_pagination.KeysetPagination, "page_size", 1)
+    def test_get_guest_cursor(self):
+        user2 = core_factories.UserFactory()
+        comment = posts_factories.CommentFactory(owner=user2, post=self.public_post)
+        posts_factories.ReactionFactory(owner=user2, post=self.public_post)
+        posts_factories.ReactionFactory(owner=user2, comment=comment)
+
+        expected_ids = [
+            test_utils.last_url_pk(reaction["url"])
+            for reaction in self.client.get(self.url).data["results"]
+        ]
+        url = f"{self.url}?cursor="
+        ids = []
+
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data["results"]), 1)
+            ids.append(test_utils.last_url_pk(res.data["results"][0]["url"]))
+            url = res.data["next"]
+
+        self.assertEqual(ids, expected_ids)
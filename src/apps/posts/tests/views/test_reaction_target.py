@@ -0,0 +1,143 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ....core import model_factories as core_factories
+from ....core.tests import utils as test_utils
+from ... import model_factories as posts_factories
+from ... import models as posts_models
+
+
+class ReactionTargetTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        self.user1 = core_factories.UserFactory()
+        self.user2 = core_factories.UserFactory()
+        self.post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[posts_factories.TagFactory()],
+        )
+        self.comment = posts_factories.CommentFactory(owner=self.user1, post=self.post)
+        return super().setUp()
+
+    def get_post_url(self, pk):
+        return reverse("post-reaction", kwargs={"pk": pk})
+
+    def get_comment_url(self, pk):
+        return reverse("comment-reaction", kwargs={"pk": pk})
+
+    def test_put_delete_guest(self):
+        for method in ("put", "delete"):
+            method_func = getattr(self.client, method)
+
+            with self.assertLogs("django.request", level="WARNING"):
+                res = method_func(self.get_post_url(self.post.id), {"type": "L"})
+
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_put_post(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+        url = self.get_post_url(self.post.id)
+
+        res = self.client.put(url, {"type": "L"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data, {"type": "Like", "like_count": 1, "dislike_count": 0}
+        )
+
+        # Repeating the request changes nothing
+        res = self.client.put(url, {"type": "L"})
+        self.assertEqual(
+            res.data, {"type": "Like", "like_count": 1, "dislike_count": 0}
+        )
+
+        res = self.client.put(url, {"type": "D"})
+        self.assertEqual(
+            res.data, {"type": "Dislike", "like_count": 0, "dislike_count": 1}
+        )
+
+        reactions = posts_models.Reaction.objects.filter(owner=self.user2)
+        self.assertEqual(
+            list(reactions.values_list("type", "post")), [("D", self.post.id)]
+        )
+
+    def test_put_comment(self):
+        posts_factories.ReactionFactory(
+            owner=self.user1,
+            comment=self.comment,
+            type=posts_models.Reaction.ReactionType.DISLIKE,
+        )
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        res = self.client.put(self.get_comment_url(self.comment.id), {"type": "L"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data, {"type": "Like", "like_count": 1, "dislike_count": 1}
+        )
+        self.assertTrue(
+            posts_models.Reaction.objects.filter(
+                owner=self.user2, comment=self.comment, type="L"
+            ).exists()
+        )
+
+    def test_put_invalid_type(self):
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.put(self.get_post_url(self.post.id), {"type": "X"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_put_private_post(self):
+        self.post.publish_date = None
+        self.post.save()
+        test_utils.jwt_login(self.client, self.user1.username)
+
+        for url in (
+            self.get_post_url(self.post.id),
+            self.get_comment_url(self.comment.id),
+        ):
+            with self.assertLogs("django.request", level="WARNING"):
+                res = self.client.put(url, {"type": "L"})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # The post is not visible to other users
+        test_utils.jwt_login(self.client, self.user2.username)
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.put(self.get_post_url(self.post.id), {"type": "L"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(posts_models.Reaction.objects.exists())
+
+    def test_delete(self):
+        posts_factories.ReactionFactory(
+            owner=self.user2,
+            post=self.post,
+            type=posts_models.Reaction.ReactionType.LIKE,
+        )
+        test_utils.jwt_login(self.client, self.user2.username)
+        url = self.get_post_url(self.post.id)
+
+        res = self.client.delete(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"type": None, "like_count": 0, "dislike_count": 0})
+        self.assertFalse(
+            posts_models.Reaction.objects.filter(owner=self.user2).exists()
+        )
+
+        # Deleting a missing reaction changes nothing
+        res = self.client.delete(url)
+        self.assertEqual(res.data, {"type": None, "like_count": 0, "dislike_count": 0})
@@ -0,0 +1,266 @@
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ....core import caching
+from ....core import model_factories as core_factories
+from ....core.tests import utils as test_utils
+from ... import model_factories as posts_factories
+from ... import models as posts_models
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "shared": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "responses": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "response-cache-test",
+        },
+    }
+)
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        def clean_excluding_thumbnail(self, exclude=None):
+            exclude = list(exclude or []) + ["thumbnail"]
+            super(posts_models.Post, self).clean_fields(exclude=exclude)
+
+        patcher = mock.patch("apps.posts.models.Post.clean_fields", autospec=True)
+        self.mock_clean_fields = patcher.start()
+        self.mock_clean_fields.side_effect = clean_excluding_thumbnail
+        self.addCleanup(patcher.stop)
+
+        caching.get_cache().clear()
+
+        self.user1 = core_factories.UserFactory()
+        self.user1.groups.add(Group.objects.create(name="author"))
+        self.tag = posts_factories.TagFactory()
+        self.public_post = posts_factories.PostFactory(
+            owner=self.user1,
+            thumbnail="https://fake-url.com/media/thumbnail.webp",
+            tags=[self.tag],
+        )
+        self.private_post = posts_factories.PostFactory(
+            owner=self.user1, thumbnail="", publish_date=None
+        )
+
+        self.list_url = reverse("post-list")
+        self.detail_url = reverse("post-detail", args=[self.public_post.pk])
+        return super().setUp()
+
+    def get_without_queries(self, url, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, **kwargs)
+
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and "silk_" not in query["sql"]
+        ]
+        self.assertEqual(queries, [])
+        return res
+
+    def test_get_list_cached(self):
+        res = self.client.get(self.list_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        cached_res = self.get_without_queries(self.list_url)
+        self.assertEqual(cached_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_res.json(), res.json())
+
+    def test_get_list_cached_normalized_params(self):
+        res = self.client.get(self.list_url, {"view": "full", "page": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        cached_res = self.get_without_queries(f"{self.list_url}?page=1&view=full")
+        self.assertEqual(cached_res.json(), res.json())
+
+    def test_get_list_cached_by_param_value_order(self):
+        tag_list_url = reverse("tag-list")
+        posts_factories.TagFactory()
+        res = self.client.get(f"{tag_list_url}?ordering=title&ordering=-title")
+        titles = [tag["title"] for tag in res.json()["results"]]
+
+        res = self.client.get(f"{tag_list_url}?ordering=-title&ordering=title")
+        self.assertEqual([tag["title"] for tag in res.json()["results"]], titles[::-1])
+
+    def test_get_detail_cached_with_etag(self):
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        cached_res = self.get_without_queries(self.detail_url)
+        self.assertEqual(cached_res.json(), res.json())
+        self.assertEqual(cached_res["ETag"], res["ETag"])
+
+        # Conditional requests are answered from the row version
+        res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_sharded_by_user(self):
+        res = self.client.get(self.list_url)
+        self.assertEqual(len(res.json()["results"]), 1)
+
+        test_utils.jwt_login(self.client, self.user1.username)
+        res = self.client.get(self.list_url)
+        self.assertEqual(len(res.json()["results"]), 2)
+
+    def test_not_found_not_cached(self):
+        url = reverse("post-detail", args=[self.private_post.pk])
+
+        with self.assertLogs("django.request", level="WARNING"):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.private_post.publish_date = self.public_post.publish_date
+        self.private_post.thumbnail = self.public_post.thumbnail
+        self.private_post.save(update_fields=["publish_date", "thumbnail"])
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalidate_on_reaction(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            posts_models.Reaction.objects.create(
+                owner=self.user1,
+                post=self.public_post,
+                type=posts_models.Reaction.ReactionType.LIKE,
+            )
+
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["like_count"], 1)
+
+    def test_invalidate_on_comment(self):
+        self.client.get(self.detail_url)
+        comment_list_url = reverse("comment-list")
+        self.client.get(comment_list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            posts_factories.CommentFactory(owner=self.user1, post=self.public_post)
+
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["comment_count"], 1)
+        res = self.client.get(comment_list_url)
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    def test_invalidate_on_tag_change(self):
+        tag_list_url = reverse("tag-list")
+        self.client.get(tag_list_url)
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.title = "renamed"
+            self.tag.save()
+
+        res = self.client.get(tag_list_url)
+        self.assertEqual(res.json()["results"][0]["title"], "renamed")
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["tags"], ["renamed"])
+
+    def test_invalidate_on_tags_change(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = posts_factories.TagFactory()
+            self.public_post.tags.add(tag)
+
+        res = self.client.get(self.detail_url)
+        self.assertEqual(len(res.json()["tags"]), 2)
+
+    def test_invalidate_on_username_change(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.username = "renamed"
+            self.user1.save()
+
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["owner"], "renamed")
+
+    def test_invalidate_on_owner_delete(self):
+        user2 = core_factories.UserFactory()
+        comment = posts_factories.CommentFactory(owner=user2, post=self.public_post)
+        comment_url = reverse("comment-detail", args=[comment.pk])
+        self.client.get(comment_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user2.delete()
+
+        res = self.client.get(comment_url)
+        self.assertNotIn("owner", res.json())
+
+    def test_invalidate_on_post_delete(self):
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.public_post.delete()
+
+        res = self.client.get(self.list_url)
+        self.assertEqual(res.json()["results"], [])
+
+    def test_invalidate_once_per_transaction(self):
+        for _ in range(3):
+            posts_factories.CommentFactory(owner=self.user1, post=self.public_post)
+
+        with mock.patch.object(
+            caching, "_replace_generations", wraps=caching._replace_generations
+        ) as mock_replace:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.public_post.delete()
+
+        mock_replace.assert_called_once()
+        self.assertEqual(
+            set(mock_replace.call_args.args[0]), {"posts", "comments", "tags"}
+        )
+
+
+class FileBasedResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+                "shared": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+                "responses": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir.name,
+                },
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.tag = posts_factories.TagFactory()
+        self.url = reverse("tag-list")
+        return super().setUp()
+
+    def test_get_cached_and_invalidated(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as context:
+            cached_res = self.client.get(self.url)
+
+        self.assertFalse(
+            any(
+                query["sql"].startswith("SELECT") and "silk_" not in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+        self.assertEqual(cached_res.json(), res.json())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.delete()
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["results"], [])
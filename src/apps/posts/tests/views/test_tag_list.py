@@ -67,3 +67,22 @@ class TagListTest(APITestCase):
             res = self.client.post(self.url)
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_guest_ordering(self):
+        popular_tag = posts_factories.TagFactory()
+        posts_models.Tag.objects.filter(pk=popular_tag.pk).update(
+            post_count=3, published_post_count=1
+        )
+        posts_models.Tag.objects.filter(pk=self.tag.pk).update(
+            post_count=1, published_post_count=2
+        )
+
+        res = self.client.get(self.url, {"ordering": "-post_count"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [test_utils.last_url_pk(tag["url"]) for tag in res.data["results"]]
+        self.assertEqual(ids, [popular_tag.id, self.tag.id])
+        self.assertEqual(res.data["results"][0]["post_count"], 3)
+
+        res = self.client.get(self.url, {"ordering": "-published_post_count"})
+        ids = [test_utils.last_url_pk(tag["url"]) for tag in res.data["results"]]
+        self.assertEqual(ids, [self.tag.id, popular_tag.id])
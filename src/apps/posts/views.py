@@ -1,8 +1,15 @@
-from django.db import models
+from django.db import IntegrityError, models
 from rest_framework import permissions as perms
-from rest_framework import viewsets
-
+from rest_framework import serializers as serials
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ..core import caching
+from ..core import mixins as core_mixins
+from ..core import pagination as core_pagination
 from ..core import permissions as core_perms
+from ..core import throttling as core_throttling
 from . import filters as app_filters
 from . import models as app_models
 from . import permissions as app_perms
@@ -10,7 +17,14 @@ from . import serializers as app_serials
 
 
 # View/edit tags
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.IdentityMapMixin,
+    core_mixins.CachedReadMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespace = "tags"
     queryset = app_models.Tag.objects.all().order_by("title")
     serializer_class = app_serials.TagSerializer
     filterset_class = app_filters.TagFilter
@@ -28,15 +42,90 @@ class TagViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
+class ReactionTargetMixin:
+    """
+    Set the reaction of the user to an object with PUT on its reaction, and
+    remove it with DELETE. Each is a single write that cannot conflict with
+    a concurrent one of the user, and responds with the new counts.
+    """
+
+    # The Reaction field of the target
+    reaction_target_field = None
+
+    @action(detail=True, methods=["put", "delete"])
+    def reaction(self, request, pk=None):
+        target = self.get_object()
+        self.check_reaction_target(target)
+        target_kwargs = {f"{self.reaction_target_field}_id": target.pk}
+        reaction_type = None
+
+        if request.method == "PUT":
+            serializer = app_serials.ReactionTypeSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            reaction_type = serializer.validated_data["type"]
+            app_models.Reaction.upsert(request.user.pk, reaction_type, **target_kwargs)
+        else:
+            app_models.Reaction.remove(request.user.pk, **target_kwargs)
+
+        # The writes bypass the Reaction signals, see posts.signals
+        caching.invalidate("posts", "comments")
+        counts = (
+            type(target)
+            .objects.filter(pk=target.pk)
+            .values("like_count", "dislike_count")
+            .get()
+        )
+        label = None
+
+        if reaction_type is not None:
+            label = app_models.Reaction.ReactionType(reaction_type).label
+
+        return Response({"type": label, **counts})
+
+    def check_reaction_target(self, target):
+        pass
+
+
+class BulkDeleteMixin:
+    """
+    Let moderators delete the objects matching ids or filters at once, with
+    the set based deletes of the model's bulk_delete. Responds with the
+    counts of deleted objects.
+    """
+
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        serializer = app_serials.BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        model = self.queryset.model
+        counts = model.bulk_delete(serializer.filter(model.objects.all()))
+        return Response(counts)
+
+
 # View/edit posts
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.TokenBucketThrottleMixin,
+    core_mixins.IdentityMapMixin,
+    ReactionTargetMixin,
+    core_mixins.CachedReadMixin,
+    core_mixins.ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespace = "posts"
+    reaction_target_field = "post"
     queryset = (
         app_models.Post.objects.select_related("owner")
         .prefetch_related("tags")
-        .prefetch_related("comments")
         .order_by("title", "-publish_date")
     )
     serializer_class = app_serials.PostSerializer
+    throttle_classes = [
+        core_throttling.UserWriteThrottle,
+        core_throttling.IPWriteThrottle,
+    ]
+    pagination_class = core_pagination.CursorOptInPagination
     filterset_class = app_filters.PostFilter
 
     # An author can create.
@@ -54,31 +143,82 @@ class PostViewSet(viewsets.ModelViewSet):
 
         return super().get_permissions()
 
+    # Lists are summaries unless the full view is requested
+    def is_summary(self):
+        return self.action == "list" and self.request.query_params.get("view") != "full"
+
+    # The unbounded list of comment links must be requested with ?expand=comments
+    def is_expanded(self, field_name):
+        expand = self.request.query_params.get("expand", "")
+        return field_name in expand.split(",")
+
     def get_queryset(self):
         filter = models.Q(publish_date__isnull=False)
 
         if self.request.user.is_authenticated:
             filter |= models.Q(owner=self.request.user)
 
-        return (
-            super()
-            .get_queryset()
-            .filter(filter)
-            .annotate(
-                like_count=models.Count(
-                    "reactions",
-                    filter=models.Q(
-                        reactions__type=app_models.Reaction.ReactionType.LIKE
-                    ),
-                ),
-                dislike_count=models.Count(
-                    "reactions",
-                    filter=models.Q(
-                        reactions__type=app_models.Reaction.ReactionType.DISLIKE
-                    ),
-                ),
+        queryset = super().get_queryset().filter(filter)
+
+        if self.action == "comments":
+            # Only the visibility of the post is needed
+            return queryset.select_related(None).prefetch_related(None).only("pk")
+
+        if self.action == "reaction":
+            # Only whether the post is published is needed
+            return (
+                queryset.select_related(None)
+                .prefetch_related(None)
+                .only("pk", "publish_date")
+            )
+
+        if self.is_summary():
+            queryset = queryset.defer("content")
+
+        if self.is_expanded("comments"):
+            queryset = queryset.prefetch_related(
+                models.Prefetch(
+                    "comments",
+                    queryset=app_models.Comment.objects.only("pk", "post"),
+                )
             )
+
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        excluded_fields = set()
+
+        if self.is_summary() and kwargs.get("many"):
+            excluded_fields.add("content")
+
+        if not self.is_expanded("comments"):
+            excluded_fields.add("comments")
+
+        kwargs["fields"] = [
+            field
+            for field in self.get_serializer_class().Meta.fields
+            if field not in excluded_fields
+        ]
+        return super().get_serializer(*args, **kwargs)
+
+    # Paginated comments of a post
+    @action(detail=True)
+    def comments(self, request, pk=None):
+        post = self.get_object()
+        queryset = (
+            app_models.Comment.objects.filter(post=post)
+            .select_related("owner")
+            .order_by("-create_date", "-pk")
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = app_serials.CommentSerializer(
+            page, many=True, context=self.get_serializer_context()
         )
+        return self.get_paginated_response(serializer.data)
+
+    def check_reaction_target(self, post):
+        if not post.publish_date:
+            raise serials.ValidationError("A reaction cannot target a private post.")
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -86,16 +226,33 @@ class PostViewSet(viewsets.ModelViewSet):
 
 
 # View/edit comments
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.TokenBucketThrottleMixin,
+    core_mixins.IdentityMapMixin,
+    BulkDeleteMixin,
+    ReactionTargetMixin,
+    core_mixins.CachedReadMixin,
+    core_mixins.ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespace = "comments"
+    reaction_target_field = "comment"
     queryset = app_models.Comment.objects.select_related("owner").order_by(
         "post", "-create_date"
     )
     serializer_class = app_serials.CommentSerializer
+    throttle_classes = [
+        core_throttling.UserWriteThrottle,
+        core_throttling.IPWriteThrottle,
+    ]
+    pagination_class = core_pagination.CursorOptInPagination
     filterset_class = app_filters.CommentFilter
 
     # A commenter can create.
     # A commenter that owns the comment can update/delete.
-    # A moderator can update/delete.
+    # A moderator can update/delete, also in bulk.
     def get_permissions(self):
         self.permission_classes = [perms.IsAuthenticatedOrReadOnly]
 
@@ -105,6 +262,8 @@ class CommentViewSet(viewsets.ModelViewSet):
             self.permission_classes += [
                 (app_perms.IsCommenter & core_perms.IsOwner) | core_perms.IsModerator
             ]
+        elif self.action == "bulk_delete":
+            self.permission_classes += [core_perms.IsModerator]
 
         return super().get_permissions()
 
@@ -115,25 +274,23 @@ class CommentViewSet(viewsets.ModelViewSet):
             filter |= models.Q(owner=self.request.user)
             filter |= models.Q(post__owner=self.request.user)
 
-        return (
-            super()
-            .get_queryset()
-            .filter(filter)
-            .annotate(
-                like_count=models.Count(
-                    "reactions",
-                    filter=models.Q(
-                        reactions__type=app_models.Reaction.ReactionType.LIKE
-                    ),
-                ),
-                dislike_count=models.Count(
-                    "reactions",
-                    filter=models.Q(
-                        reactions__type=app_models.Reaction.ReactionType.DISLIKE
-                    ),
-                ),
+        queryset = super().get_queryset().filter(filter)
+
+        if self.action == "reaction":
+            # Only whether the post is published is needed
+            return (
+                queryset.select_related(None)
+                .select_related("post")
+                .only("pk", "post__publish_date")
+            )
+
+        return queryset
+
+    def check_reaction_target(self, comment):
+        if not comment.post.publish_date:
+            raise serials.ValidationError(
+                "A reaction cannot target a comment of a private post."
             )
-        )
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -141,21 +298,46 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 
 # View/edit reactions
-class ReactionViewSet(viewsets.ModelViewSet):
+class ReactionViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.TokenBucketThrottleMixin,
+    core_mixins.IdentityMapMixin,
+    BulkDeleteMixin,
+    viewsets.ModelViewSet,
+):
     queryset = app_models.Reaction.objects.select_related("owner").order_by(
         "owner__username", "-create_date"
     )
     serializer_class = app_serials.ReactionSerializer
+    throttle_classes = [
+        core_throttling.UserWriteThrottle,
+        core_throttling.IPWriteThrottle,
+    ]
+    pagination_class = core_pagination.CursorOptInPagination
     filterset_class = app_filters.ReactionFilter
+    batch_max_size = 500
 
     def get_permissions(self):
         self.permission_classes = [perms.IsAuthenticatedOrReadOnly]
 
         if self.action in ("update", "partial_update", "destroy"):
             self.permission_classes += [core_perms.IsOwner]
+        elif self.action == "bulk_delete":
+            self.permission_classes += [core_perms.IsModerator]
 
         return super().get_permissions()
 
+    def get_throttles(self):
+        if self.action == "batch":
+            self.throttle_classes = [
+                *self.throttle_classes,
+                core_throttling.UserBatchThrottle,
+                core_throttling.IPBatchThrottle,
+            ]
+
+        return super().get_throttles()
+
     def get_queryset(self):
         post_filter = models.Q(post__isnull=False)
         comment_filter = models.Q(comment__isnull=False)
@@ -174,6 +356,88 @@ class ReactionViewSet(viewsets.ModelViewSet):
 
         return super().get_queryset().filter(filter)
 
+    # Set many reactions of the user at once, e.g. those queued by an offline
+    # client. Items are validated and written together, and each gets its own
+    # result. A later item for the same target supersedes an earlier one.
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        if not isinstance(request.data, list):
+            raise serials.ValidationError("Expected a list of reactions.")
+
+        if len(request.data) > self.batch_max_size:
+            raise serials.ValidationError(
+                f"A batch must have at most {self.batch_max_size} reactions."
+            )
+
+        results = [None] * len(request.data)
+        items = {}
+
+        for index, data in enumerate(request.data):
+            serializer = app_serials.ReactionBatchItemSerializer(data=data)
+
+            if not serializer.is_valid():
+                results[index] = {"status": "invalid", "errors": serializer.errors}
+                continue
+
+            item = serializer.validated_data
+            target = (item.get("post"), item.get("comment"))
+
+            if target in items:
+                results[items[target][0]] = {"status": "superseded"}
+
+            items[target] = (index, item["type"])
+
+        # The targets that can be reacted to, found in one query
+        post_ids = [post_id for post_id, _ in items if post_id is not None]
+        comment_ids = [comment_id for _, comment_id in items if comment_id is not None]
+        target_field = models.CharField()
+        reactable = set(
+            app_models.Post.objects.filter(pk__in=post_ids, publish_date__isnull=False)
+            .values_list(models.Value("post", output_field=target_field), "pk")
+            .union(
+                app_models.Comment.objects.filter(
+                    pk__in=comment_ids, post__publish_date__isnull=False
+                ).values_list(models.Value("comment", output_field=target_field), "pk"),
+                all=True,
+            )
+        )
+        reactions = []
+        indexes = []
+
+        for (post_id, comment_id), (index, reaction_type) in items.items():
+            if ("post", post_id) in reactable or ("comment", comment_id) in reactable:
+                reactions.append((reaction_type, post_id, comment_id))
+                indexes.append(index)
+            else:
+                results[index] = {
+                    "status": "not_found",
+                    "errors": ["The target does not exist or is not published."],
+                }
+
+        try:
+            previous_types = app_models.Reaction.bulk_upsert(request.user.pk, reactions)
+        except IntegrityError:
+            return Response(
+                {"detail": "The reactions changed concurrently, retry the batch."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        for index, previous_type, (reaction_type, _, _) in zip(
+            indexes, previous_types, reactions
+        ):
+            if previous_type is None:
+                results[index] = {"status": "created"}
+            elif previous_type != reaction_type:
+                results[index] = {"status": "updated"}
+            else:
+                results[index] = {"status": "unchanged"}
+
+        # The writes bypass the Reaction signals, see posts.signals
+        if reactions:
+            caching.invalidate("posts", "comments")
+
+        return Response(results)
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
         return super().perform_create(serializer)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0005_alter_profile_followers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
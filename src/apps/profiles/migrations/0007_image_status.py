@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+# URLs saved before are verified in the background like new ones
+def verify_blank_pics(apps, schema_editor):
+    Profile = apps.get_model("profiles", "Profile")
+    Profile.objects.filter(pic="").update(pic_status="verified")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0006_row_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="pic_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("verified", "Verified"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=8,
+            ),
+        ),
+        migrations.RunPython(verify_blank_pics, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,25 @@
 from django.conf import settings
 from django.db import models
 
+from ..core.models import ImageStatus, VerifiedImagesModel, VersionedModel
 from ..core.validators import validate_image_url
 
 
-class Profile(models.Model):
+class Profile(VersionedModel, VerifiedImagesModel):
+    tracked_fields = ("pic",)
+    validate_changed_only = ("pic",)
+    verified_image_fields = {"pic": "pic_status"}
+
     owner = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile"
     )
     pic = models.URLField(blank=True, validators=[validate_image_url])
+    pic_status = models.CharField(
+        max_length=8,
+        choices=ImageStatus,
+        default=ImageStatus.PENDING,
+        editable=False,
+    )
     bio = models.TextField(max_length=300, blank=True)
     followers = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="following", blank=True
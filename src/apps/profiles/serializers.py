@@ -1,12 +1,18 @@
 from rest_framework import serializers
 
 from ..core.serializers import base as base_serials
+from ..core.serializers import mixins as serial_mixins
 from .models import Profile
 
 
-class ProfileSerializer(base_serials.HyperlinkedReprnModelSerializer):
+class ProfileSerializer(
+    serial_mixins.ChangedOnlyValidationMixin,
+    base_serials.HyperlinkedReprnModelSerializer,
+):
     owner = serializers.ReadOnlyField(source="owner.username")
 
     class Meta:
         model = Profile
-        fields = ["url", "owner", "pic", "bio", "followers"]
+        fields = ["url", "owner", "pic", "pic_status", "bio", "followers"]
+        # Validated over the network
+        validate_changed_only = ["pic"]
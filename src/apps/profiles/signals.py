@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db import models
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 
+from ..core import signals as core_signals
 from . import models as app_models
 
 """
@@ -14,3 +16,49 @@ def create_profile(sender, instance, created, **kwargs):
     if created:
         profile = app_models.Profile(owner=instance)
         profile.save()
+
+
+"""
+Increment the version of profiles whose followers change.
+The instance is a user when followers are changed through user.following,
+in which case a clear is handled before the followed profiles are lost.
+"""
+
+
+@receiver(m2m_changed, sender=app_models.Profile.followers.through)
+def update_version_on_followers_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        profiles = app_models.Profile.objects.filter(pk=instance.pk)
+    elif reverse and action in ("post_add", "post_remove"):
+        profiles = app_models.Profile.objects.filter(pk__in=pk_set)
+    elif reverse and action == "pre_clear":
+        profiles = app_models.Profile.objects.filter(followers=instance)
+    else:
+        return
+
+    profiles.update(version=models.F("version") + 1)
+
+
+"""
+Increment the version of the profile of a user whose username changes, since
+it is part of the profile representation. A deleted user is removed from the
+followers of the profiles they follow without M2M signals, so those profiles
+are found before the deletion.
+"""
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_version_on_username_change(sender, instance, **kwargs):
+    if core_signals.username_changed(instance):
+        app_models.Profile.objects.filter(owner=instance).update(
+            version=models.F("version") + 1
+        )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def update_version_on_follower_delete(sender, instance, **kwargs):
+    app_models.Profile.objects.filter(followers=instance).update(
+        version=models.F("version") + 1
+    )
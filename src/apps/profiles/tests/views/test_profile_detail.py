@@ -99,3 +99,37 @@ class ProfileDetailTest(APITestCase):
             res = self.client.delete(self.url)
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_guest_conditional(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Following the profile changes its followers
+        user2 = UserFactory()
+        user2.following.add(self.user1.profile)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # So does the deletion of a follower
+        user2.delete()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        etag = res["ETag"]
+
+        # A save that keeps the owner username does not
+        self.user1.set_password("new password")
+        self.user1.save()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # And so does a change of the owner username
+        self.user1.username = "renamed"
+        self.user1.save()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
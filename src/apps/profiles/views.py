@@ -1,13 +1,20 @@
 from rest_framework import exceptions, viewsets
 from rest_framework import permissions as perms
 
+from ..core import mixins as core_mixins
 from ..core import permissions as core_perms
 from .models import Profile
 from .serializers import ProfileSerializer
 
 
 # View/edit profiles
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(
+    core_mixins.AtomicWritesMixin,
+    core_mixins.ReplicaReadsMixin,
+    core_mixins.IdentityMapMixin,
+    core_mixins.ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Profile.objects.select_related("owner")
         .prefetch_related("followers")
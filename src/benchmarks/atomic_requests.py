@@ -0,0 +1,102 @@
+"""
+Benchmark read requests with ATOMIC_REQUESTS on.
+Compares post and tag list requests run in a request transaction, as every
+request was before AtomicWritesMixin, with the same requests in autocommit.
+The gain is a BEGIN and COMMIT per request, each a round trip on PostgreSQL.
+A throwaway test database is created.
+
+Run from the src directory:
+    python -m benchmarks.atomic_requests --posts 1000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "techstack_api.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import resolve  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.posts.models import Post  # noqa: E402
+
+
+def populate(post_count):
+    # Posts are inserted directly to skip validation of their thumbnails
+    Post.objects.bulk_create(
+        [
+            Post(
+                title=f"Benchmark post number {i}",
+                publish_date="2024-01-01",
+                content="wordy " * 400,
+            )
+            for i in range(post_count)
+        ],
+        batch_size=5000,
+    )
+
+
+def measure(func, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    connection.settings_dict["ATOMIC_REQUESTS"] = True
+
+    try:
+        populate(args.posts)
+        client = APIClient()
+        paths = ["/api/v1/posts/", "/api/v1/tags/", "/api/v1/posts/?view=full"]
+
+        print(f"{connection.vendor}: {args.posts} posts")
+        print("path                      atomic (ms)  autocommit (ms)")
+
+        # Cached responses would hide the transaction
+        with override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            }
+        ):
+            for path in paths:
+                view = resolve(path.split("?")[0]).func
+                exempt_aliases = view._non_atomic_requests
+
+                # Without the exemption, the handler wraps the view in a
+                # transaction
+                view._non_atomic_requests = set()
+                atomic_ms = measure(lambda: client.get(path), args.repeat)
+                view._non_atomic_requests = exempt_aliases
+                autocommit_ms = measure(lambda: client.get(path), args.repeat)
+
+                print(f"{path:<25} {atomic_ms:>11.2f}  {autocommit_ms:>15.2f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark owner filtered post lists against a large user table.
+Compares the indexed username filter with the icontains scan it replaced, on
+the configured database backend (on PostgreSQL both use the trigram index).
+A throwaway test database is created.
+
+Run from the src directory:
+    python -m benchmarks.username_filter --users 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "techstack_api.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.core.filters import UsernameFilter  # noqa: E402
+from apps.core.models import UsernameToken  # noqa: E402
+from apps.posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+
+def populate(user_count, post_count):
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"{''.join(random.choices(string.ascii_letters, k=8))}{i}",
+                password="!",
+            )
+            for i in range(user_count)
+        ],
+        batch_size=5000,
+    )
+    UsernameToken.objects.bulk_create(
+        (
+            UsernameToken(user=user, token=token)
+            for user in users
+            for token in UsernameToken.tokenize(user.username)
+        ),
+        batch_size=5000,
+    )
+    # Posts are inserted directly to skip validation of their thumbnails
+    Post.objects.bulk_create(
+        [
+            Post(
+                owner=random.choice(users),
+                title=f"Benchmark post number {i}",
+                publish_date="2024-01-01",
+                content="wordy " * 400,
+            )
+            for i in range(post_count)
+        ],
+        batch_size=5000,
+    )
+    return users
+
+
+def measure(func, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        users = populate(args.users, args.posts)
+        queries = [users[0].username[2:6], users[-1].username[-4:], "zzzzzz"]
+        client = APIClient()
+        owner_filter = UsernameFilter(field_name="owner")
+
+        print(f"{connection.vendor}: {args.users} users, {args.posts} posts")
+        print("query     icontains (ms)  indexed (ms)  endpoint (ms)")
+
+        for query in queries:
+            legacy_ms = measure(
+                lambda: list(
+                    Post.objects.filter(owner__username__icontains=query)
+                    .order_by("title", "-publish_date")
+                    .values_list("pk", flat=True)[:10]
+                ),
+                args.repeat,
+            )
+            indexed_ms = measure(
+                lambda: list(
+                    owner_filter.filter(Post.objects.all(), query)
+                    .order_by("title", "-publish_date")
+                    .values_list("pk", flat=True)[:10]
+                ),
+                args.repeat,
+            )
+
+            # Cached responses would hide the query
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+                    }
+                }
+            ):
+                endpoint_ms = measure(
+                    lambda: client.get("/api/v1/posts/", {"owner": query}),
+                    args.repeat,
+                )
+
+            print(
+                f"{query:<9} {legacy_ms:>14.2f}  {indexed_ms:>12.2f}  "
+                f"{endpoint_ms:>13.2f}"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
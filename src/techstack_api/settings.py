@@ -11,9 +11,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "silk.middleware.SilkyMiddleware",
+    "apps.core.middleware.ReplicaPinningMiddleware",
 ]
 
 TESTING = "test" in sys.argv
@@ -102,21 +104,138 @@ DATABASES = {
 
 CONN_MAX_AGE = config("CONN_MAX_AGE", default=30, cast=int)
 DATABASE_URL = config("DATABASE_URL", default=None)
+# Connection pool of each worker process, on PostgreSQL only
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+DB_POOL_MIN_SIZE = config("DB_POOL_MIN_SIZE", default=2, cast=int)
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=10, cast=int)
+# Seconds to wait for a connection before failing the request
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=10, cast=float)
+# Seconds after which a connection is replaced
+DB_POOL_MAX_LIFETIME = config("DB_POOL_MAX_LIFETIME", default=1800, cast=float)
+
+# Read only replicas of the database, see core.db_routers
+REPLICA_DATABASE_URLS = config("REPLICA_DATABASE_URLS", default="", cast=Csv())
+# Seconds for which the reads of a client go to the primary after it writes
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+REPLICA_DATABASES = []
 
 if DATABASE_URL is not None:
     import dj_database_url
 
-    db_config = dj_database_url.config(
-        default=str(DATABASE_URL),
-        conn_max_age=CONN_MAX_AGE,
-        conn_health_checks=True,
-    )
-    db_config["ATOMIC_REQUESTS"] = True
+    def get_db_config(url):
+        db_config = dj_database_url.config(
+            default=str(url),
+            conn_max_age=CONN_MAX_AGE,
+            conn_health_checks=True,
+        )
+
+        if DB_POOL and db_config["ENGINE"] == "django.db.backends.postgresql":
+            from psycopg_pool import ConnectionPool
+
+            # Pooled connections are returned to the pool after each request
+            # instead of persisting, and are checked by the pool when taken
+            db_config["CONN_MAX_AGE"] = 0
+            db_config["CONN_HEALTH_CHECKS"] = False
+            db_config.setdefault("OPTIONS", {})["pool"] = {
+                "min_size": DB_POOL_MIN_SIZE,
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": DB_POOL_TIMEOUT,
+                "max_lifetime": DB_POOL_MAX_LIFETIME,
+                "check": ConnectionPool.check_connection,
+            }
+
+        return db_config
 
     DATABASES = {
-        "default": db_config,
+        "default": {**get_db_config(DATABASE_URL), "ATOMIC_REQUESTS": True},
     }
 
+    for i, url in enumerate(REPLICA_DATABASE_URLS, start=1):
+        DATABASES[f"replica_{i}"] = get_db_config(url)
+        REPLICA_DATABASES.append(f"replica_{i}")
+
+if TESTING:
+    # The stand-in replica of the router tests, only created for those tests
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.replica.sqlite3",
+        "TEST": {"NAME": Path(tempfile.gettempdir()) / "techstack_api_replica.sqlite3"},
+    }
+
+DATABASE_ROUTERS = ["apps.core.db_routers.ReplicaRouter"]
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    },
+    # Shared by the worker processes of a host. Holds the role versions, the
+    # throttle buckets and the image checks, which must not be culled, since
+    # a culled group version makes every issued access token stale and a
+    # culled bucket is full again.
+    "shared": {
+        "BACKEND": config(
+            "SHARED_CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": config(
+            "SHARED_CACHE_LOCATION",
+            default=str(Path(tempfile.gettempdir()) / "techstack_api_cache"),
+        ),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("SHARED_CACHE_MAX_ENTRIES", default=100000, cast=int)
+        },
+    },
+    # Responses, shared by the worker processes of a host and culled on their
+    # own, see core.caching
+    "responses": {
+        "BACKEND": config(
+            "RESPONSE_CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": config(
+            "RESPONSE_CACHE_LOCATION",
+            default=str(Path(tempfile.gettempdir()) / "techstack_api_responses"),
+        ),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("RESPONSE_CACHE_MAX_ENTRIES", default=10000, cast=int)
+        },
+    },
+}
+
+if TESTING:
+    # Tests that exercise caching override this
+    CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        for alias in CACHES
+    }
+
+# Responses must be shared by the worker processes, since invalidation only
+# reaches the cache of the process that made the write otherwise
+RESPONSE_CACHE_ALIAS = config("RESPONSE_CACHE_ALIAS", default="responses")
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", default=300, cast=int)
+
+# Users whose roles are memoized by each worker process, see core.roles
+ROLE_CACHE_SIZE = config("ROLE_CACHE_SIZE", default=1024, cast=int)
+# Seconds for which a worker process trusts the auth version it last read
+AUTH_VERSION_CACHE_SECONDS = config("AUTH_VERSION_CACHE_SECONDS", default=5, cast=int)
+
+# Results of image URL validation, in seconds
+IMAGE_URL_CACHE_TIMEOUT = config("IMAGE_URL_CACHE_TIMEOUT", default=86400, cast=int)
+IMAGE_URL_NEGATIVE_CACHE_TIMEOUT = config(
+    "IMAGE_URL_NEGATIVE_CACHE_TIMEOUT", default=300, cast=int
+)
+# Number of image URLs requested at once by the background verifier
+IMAGE_VERIFY_CONCURRENCY = config("IMAGE_VERIFY_CONCURRENCY", default=8, cast=int)
+PUBLISH_REQUIRES_VERIFIED_THUMBNAIL = config(
+    "PUBLISH_REQUIRES_VERIFIED_THUMBNAIL", default=False, cast=bool
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -175,12 +294,28 @@ LOGGING = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.core.authentication.StatelessJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # Proxies trusted to set X-Forwarded-For, see core.throttling
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
+    # Token buckets of writes, see core.throttling
+    "DEFAULT_THROTTLE_RATES": {
+        "user_writes": config("USER_WRITE_THROTTLE_RATE", default="60/min"),
+        "ip_writes": config("IP_WRITE_THROTTLE_RATE", default="120/min"),
+        # Batches write many reactions at once, so they have buckets of their own
+        "user_batches": config("USER_BATCH_THROTTLE_RATE", default="2/min"),
+        "ip_batches": config("IP_BATCH_THROTTLE_RATE", default="4/min"),
+    },
+}
+
+THROTTLE_CACHE_ALIAS = "shared"
+
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "apps.core.serializers.auth.TokenObtainPairSerializer",
 }
 
 DJOSER = {
@@ -24,5 +24,10 @@ urlpatterns = [
     path("api/v1/", include(root_router.urls)),
     path("api/auth/", include(auth_router.urls)),
     path("api/auth/", include("djoser.urls.jwt")),
+    path(
+        "api/db-pool-stats/",
+        core_views.DatabasePoolStatsView.as_view(),
+        name="db-pool-stats",
+    ),
     path("silk/", include("silk.urls", namespace="silk")),
 ] + debug_toolbar_urls()